@@ -32,6 +32,9 @@ Adafruit_NeoPixel lights[] = {
   Adafruit_NeoPixel(NUM_LEDS_PER_LIGHT, LIGHT_PIN_UPPER, NEO_GRBW + NEO_KHZ800),
 };
 
+// Number of executed move commands, reported to the host on SYNC
+unsigned long movesExecuted = 0;
+
 struct Move {
   char face;
   int numTurns;
@@ -71,19 +74,19 @@ int getStepperIndex(char face) {
   }
 }
 
+long getDeltaPosition(Move move) {
+  if (move.inverted) {
+    return MOTOR_STEPS_PER_TURN * (-move.numTurns);
+  }
+  return MOTOR_STEPS_PER_TURN * move.numTurns;
+}
+
 void runMove(Move move) {
   int stepperIdx = getStepperIndex(move.face);
   AccelStepper stepper = steppers[stepperIdx];
   long currentPosition = stepper.currentPosition();
-  long deltaPosition;
 
-  if (move.inverted) {
-    deltaPosition = MOTOR_STEPS_PER_TURN * (-move.numTurns);
-  } else {
-    deltaPosition = MOTOR_STEPS_PER_TURN * move.numTurns;
-  }
-
-  stepper.runToNewPosition(currentPosition + deltaPosition);
+  stepper.runToNewPosition(currentPosition + getDeltaPosition(move));
 }
 
 struct Move getMove(String command) {
@@ -102,19 +105,61 @@ struct Move getMove(String command) {
   return move;
 }
 
+// Run moves on different steppers at the same time, e.g. "R2,L'"
+int runParallelMoves(String command) {
+  int numMoves = 0;
+  int start = 0;
+  while (start < (int)command.length()) {
+    int end = command.indexOf(',', start);
+    if (end == -1) {
+      end = command.length();
+    }
+    Move move = getMove(command.substring(start, end));
+    steppers[getStepperIndex(move.face)].move(getDeltaPosition(move));
+    numMoves++;
+    start = end + 1;
+  }
+
+  bool running = true;
+  while (running) {
+    running = false;
+    for (int i = 0; i < NUM_STEPPERS; i++) {
+      if (steppers[i].run()) {
+        running = true;
+      }
+    }
+  }
+
+  return numMoves;
+}
+
 void handleCommand(String command) {
   if (command.startsWith("MOVE:")) {
     handleMoveCommand(command.substring(5));
+  } else if (command.startsWith("MOVES:")) {
+    handleParallelMoveCommand(command.substring(6));
   } else if (command.startsWith("LIGHT:")) {
     handleLightCommand(command.substring((6)));
   } else if (command.startsWith("JOG:")) {
     handleJogCommand(command.substring((4)));
+  } else if (command.startsWith("SYNC:")) {
+    handleSyncCommand();
   }
 }
 
 void handleMoveCommand(String command) {
   Move move = getMove(command);
   runMove(move);
+  movesExecuted++;
+}
+
+void handleParallelMoveCommand(String command) {
+  movesExecuted += runParallelMoves(command);
+}
+
+void handleSyncCommand() {
+  Serial.print("COUNT:");
+  Serial.println(movesExecuted);
 }
 
 void turnLightOn(int lightIndex) {
@@ -1,45 +1,110 @@
+import itertools
 import logging
 import time
 from collections.abc import Iterable
+from typing import TYPE_CHECKING
 
 import serial
 
-from rubiks_cube_solver.constants import ARDUINO_BAUDRATE, ARDUINO_PATH
+from rubiks_cube_solver.constants import (
+    ARDUINO_BAUDRATE,
+    ARDUINO_COMMAND_TIMEOUTS,
+    ARDUINO_MAX_RETRIES,
+    ARDUINO_PATH,
+    ARDUINO_READ_TIMEOUT,
+    ARDUINO_READY_TIMEOUT,
+)
 from rubiks_cube_solver.types import Position, Status
 from rubiks_cube_solver.utils import timer
 
+# move codes need numpy, which commands like `move` and `jog` only import
+# once they run a move
+if TYPE_CHECKING:
+    from rubiks_cube_solver.move import Move, Moves
+
+
+class ArduinoTimeoutError(TimeoutError):
+    pass
+
 
 class Arduino:
-    def __init__(self):
-        self.serial = serial.Serial(port=ARDUINO_PATH, baudrate=ARDUINO_BAUDRATE)
+    def __init__(
+        self,
+        port: str = ARDUINO_PATH,
+        command_timeouts: dict[str, float] = ARDUINO_COMMAND_TIMEOUTS,
+        max_retries: int = ARDUINO_MAX_RETRIES,
+        connection=None,
+    ):
+        # Any serial-like object can be passed in place of the port, e.g. to
+        # replay a recorded session
+        if connection is None:
+            connection = serial.Serial(
+                port=port, baudrate=ARDUINO_BAUDRATE, timeout=ARDUINO_READ_TIMEOUT
+            )
+        self.serial = connection
         self.move_prefix = "MOVE:"
+        self.parallel_move_prefix = "MOVES:"
         self.light_prefix = "LIGHT:"
         self.jog_prefix = "JOG:"
+        self.sync_prefix = "SYNC:"
+        self.command_timeouts = command_timeouts
+        self.max_retries = max_retries
+
+        # Number of moves the Arduino has confirmed executing since it booted
+        self.num_moves_acked = 0
+        self.num_resyncs = 0
+        self._partial_line = b""
+        self._sync_ids = itertools.count()
+
+    def get_timeout(self, message: str) -> float:
+        for prefix, timeout in self.command_timeouts.items():
+            if message.startswith(prefix):
+                return timeout
+        return max(self.command_timeouts.values())
 
     @timer
-    def write_line_and_wait_for_response(self, message: str):
+    def write_line_and_wait_for_response(self, message: str, timeout: float = None):
         self.write_line(message)
 
         logging.debug(f"Sent: {message}")
 
-        while not self.in_size() > 0:
-            time.sleep(0.01)
+        expected = f"DONE:{message.strip().upper()}"
+        deadline = time.monotonic() + (timeout or self.get_timeout(message))
+        while time.monotonic() < deadline:
+            line = self.read_line()
+            if not line:
+                continue
+
+            logging.debug(f"Received: {line}")
 
-        line = self.read_line()
+            if line == expected:
+                return line
 
-        logging.debug(f"Received: {line}")
+            logging.warning(f"Ignoring unexpected response: {line}")
 
-        return line
+        raise ArduinoTimeoutError(f"No response to {message}")
 
-    def wait_for_ready(self):
-        while self.read_line() != "STATUS:READY":
+    def wait_for_ready(self, timeout: float = ARDUINO_READY_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.read_line() == "STATUS:READY":
+                self.num_moves_acked = 0
+                logging.info("Arduino ready")
+                return
             logging.info("Waiting for Arduino to be ready...")
-            time.sleep(1)
 
+        # The Arduino may have booted before we connected, so try a handshake
+        logging.warning("Did not see ready status, attempting resync")
+        self.resync()
         logging.info("Arduino ready")
 
     def read_line(self):
-        return self.serial.readline().decode().strip()
+        """Read a complete line, or return "" if none arrives before the timeout"""
+        self._partial_line += self.serial.readline()
+        if not self._partial_line.endswith(b"\n"):
+            return ""
+        line, self._partial_line = self._partial_line, b""
+        return line.decode(errors="replace").strip()
 
     def write_line(self, message: str):
         return self.serial.write(f"{message}\n".encode("ascii"))
@@ -50,13 +115,103 @@ class Arduino:
     def out_size(self) -> int:
         return self.serial.out_waiting
 
-    def run_move(self, move: str):
-        return self.write_line_and_wait_for_response(self.move_prefix + move)
-
-    def run_moves(self, moves: Iterable[str]):
-        for move in moves:
+    def drain(self):
+        self.serial.reset_input_buffer()
+        self._partial_line = b""
+
+    def sync(self) -> int:
+        """Handshake with the Arduino and return its executed move count.
+
+        Commands are processed in order, so once the handshake is acknowledged
+        every previously sent command has finished and the count is final.
+        """
+        command = f"{self.sync_prefix}{next(self._sync_ids)}"
+        self.write_line(command)
+
+        expected = f"DONE:{command}"
+        deadline = time.monotonic() + self.get_timeout(command)
+        num_moves = None
+        while time.monotonic() < deadline:
+            line = self.read_line()
+            if line == "STATUS:READY":
+                logging.warning("Arduino restarted, resetting move count")
+                self.num_moves_acked = 0
+            elif line.startswith("COUNT:"):
+                num_moves = int(line.removeprefix("COUNT:"))
+            elif line == expected and num_moves is not None:
+                return num_moves
+            elif line:
+                logging.debug(f"Discarding stale response: {line}")
+
+        raise ArduinoTimeoutError(f"No response to {command}")
+
+    def resync(self) -> int:
+        for attempt in range(self.max_retries + 1):
+            logging.warning(f"Resyncing Arduino link (attempt {attempt + 1})")
+            self.num_resyncs += 1
+            self.drain()
+            try:
+                num_moves = self.sync()
+            except ArduinoTimeoutError:
+                continue
+
+            if num_moves < self.num_moves_acked:
+                logging.warning(
+                    f"Arduino reports {num_moves} moves, expected at least "
+                    f"{self.num_moves_acked}; assuming it restarted"
+                )
+                self.num_moves_acked = num_moves
+            return num_moves
+
+        raise ArduinoTimeoutError("Unable to resync Arduino link")
+
+    def run_counted_command(self, command: str, num_moves: int):
+        """Run a move command exactly once, recovering from stalls"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.write_line_and_wait_for_response(command)
+                self.num_moves_acked += num_moves
+                return response
+            except ArduinoTimeoutError:
+                logging.warning(f"Watchdog: {command} stalled (attempt {attempt + 1})")
+
+            # The command was either lost on the way to the Arduino (resend it)
+            # or executed with its ack lost (resume after it)
+            num_moves_executed = self.resync()
+            if num_moves_executed > self.num_moves_acked:
+                logging.warning(f"{command} executed but its ack was lost")
+                self.num_moves_acked = num_moves_executed
+                return f"DONE:{command}"
+
+        raise ArduinoTimeoutError(f"Unable to run {command}")
+
+    def run_move(self, move: "Move"):
+        if not isinstance(move, str):
+            from rubiks_cube_solver.move import to_move_string
+
+            move = to_move_string(move)
+        return self.run_counted_command(self.move_prefix + move, 1)
+
+    def run_moves(self, moves: "Moves"):
+        from rubiks_cube_solver.move import as_moves
+
+        for move in as_moves(moves):
             self.run_move(move)
 
+    def run_parallel_moves(self, moves: "Moves"):
+        """Run commuting moves on independent motors at once, with a single ack"""
+        from rubiks_cube_solver.move import as_moves, decode_moves
+
+        moves = decode_moves(as_moves(moves))
+        if len(moves) == 1:
+            return self.run_move(moves[0])
+        command = self.parallel_move_prefix + ",".join(moves)
+        return self.run_counted_command(command, len(moves))
+
+    def run_schedule(self, schedule: Iterable["Moves"]):
+        for step in schedule:
+            self.run_parallel_moves(step)
+
     def turn_light_on(self, position: Position):
         self.send_light_command(position, Status.ON)
 
@@ -65,7 +220,15 @@ class Arduino:
 
     def send_light_command(self, position: Position, status: Status):
         command = self.light_prefix + position.value + status.value
-        return self.write_line_and_wait_for_response(command)
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.write_line_and_wait_for_response(command)
+            except ArduinoTimeoutError:
+                logging.warning(f"Watchdog: {command} stalled (attempt {attempt + 1})")
+            # Light commands are idempotent, so they are simply resent
+            self.resync()
+
+        raise ArduinoTimeoutError(f"Unable to run {command}")
 
     def run_jog(self, jog: str):
         return self.write_line_and_wait_for_response(self.jog_prefix + jog)
@@ -1,12 +1,24 @@
 import json
+import logging
 from collections.abc import Iterable
+from pathlib import Path
 
-from rubiks_cube_solver.constants import FACES_PATH
-from rubiks_cube_solver.types import Calibration, Coordinate, Face
+import cv2
+import numpy as np
 
+from rubiks_cube_solver.constants import (
+    DRIFT_MIN_RESPONSE,
+    DRIFT_TOLERANCE,
+    FACES_PATH,
+    HOMOGRAPHIES_PATH,
+    POSITION_TO_FACES,
+)
+from rubiks_cube_solver.types import Calibration, Coordinate, Face, Image, Position
+from rubiks_cube_solver.utils import timer
 
-def load_calibration() -> Calibration:
-    with open(FACES_PATH) as f:
+
+def load_calibration(path: Path = FACES_PATH) -> Calibration:
+    with open(path) as f:
         faces: dict[str, list[dict]] = json.load(f)
 
     facet_coordinates: dict[Face, Iterable[Coordinate]] = {}
@@ -18,3 +30,256 @@ def load_calibration() -> Calibration:
         ]
 
     return Calibration(facet_coordinates=facet_coordinates)
+
+
+# Facet centers in face coordinates (unit square, row-major 3x3 grid)
+GRID_POINTS = np.array(
+    [[(col + 0.5) / 3, (row + 0.5) / 3] for row in range(3) for col in range(3)],
+    dtype=np.float32,
+)
+# The calibrated facets skip the center (index 4), which never changes color
+CALIBRATED_GRID_IDX = [0, 1, 2, 3, 5, 6, 7, 8]
+FACE_CORNERS = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+
+
+def project(homography: np.ndarray, points: np.ndarray) -> np.ndarray:
+    return cv2.perspectiveTransform(points.reshape(-1, 1, 2), homography).reshape(-1, 2)
+
+
+def fit_homography(coordinates: Iterable[Coordinate]) -> np.ndarray:
+    image_points = np.array([[c.x, c.y] for c in coordinates], dtype=np.float32)
+    homography, _ = cv2.findHomography(GRID_POINTS[CALIBRATED_GRID_IDX], image_points)
+    return homography
+
+
+def coordinates_to_facet_points(
+    homography: np.ndarray, coordinates: Iterable[Coordinate]
+) -> np.ndarray:
+    """Map image coordinates back to face coordinates"""
+    image_points = np.array([[c.x, c.y] for c in coordinates], dtype=np.float32)
+    return project(np.linalg.inv(homography), image_points)
+
+
+def facet_points_to_coordinates(
+    homography: np.ndarray, facet_points: np.ndarray
+) -> list[Coordinate]:
+    points = project(homography, facet_points)
+    return [Coordinate(int(round(x)), int(round(y))) for x, y in points]
+
+
+def get_edges(image: Image) -> np.ndarray:
+    gray = cv2.cvtColor(image.rgb, cv2.COLOR_BGR2GRAY).astype(np.float32)
+    dx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
+    dy = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
+    return cv2.magnitude(dx, dy)
+
+
+def get_face_roi(homography: np.ndarray, shape: tuple[int, ...], margin: float = 0.1):
+    """Bounding box (x, y, w, h) of the projected face, padded by `margin`"""
+    corners = np.array(
+        [[-margin, -margin], [1 + margin, -margin], [1 + margin, 1 + margin]]
+        + [[-margin, 1 + margin]],
+        dtype=np.float32,
+    )
+    points = project(homography, corners)
+    x0 = max(int(points[:, 0].min()), 0)
+    y0 = max(int(points[:, 1].min()), 0)
+    x1 = min(int(points[:, 0].max()), shape[1])
+    y1 = min(int(points[:, 1].max()), shape[0])
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def detect_sticker_centers(image: Image, homography: np.ndarray) -> np.ndarray:
+    """Find centers of quadrilateral sticker contours near the expected face"""
+    x, y, w, h = get_face_roi(homography, image.rgb.shape)
+    gray = cv2.cvtColor(image.rgb[y : y + h, x : x + w], cv2.COLOR_BGR2GRAY)
+    gray = cv2.GaussianBlur(gray, (5, 5), 0)
+    edges = cv2.dilate(cv2.Canny(gray, 20, 60), np.ones((3, 3), np.uint8))
+
+    cell = project(homography, np.array([[0, 0], [1 / 3, 0], [0, 1 / 3]], np.float32))
+    expected_area = abs(np.cross(cell[1] - cell[0], cell[2] - cell[0]))
+
+    contours, _ = cv2.findContours(
+        cv2.bitwise_not(edges), cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE
+    )
+    centers = []
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if not 0.2 * expected_area < area < 1.2 * expected_area:
+            continue
+        approx = cv2.approxPolyDP(contour, 0.1 * cv2.arcLength(contour, True), True)
+        if len(approx) != 4 or not cv2.isContourConvex(approx):
+            continue
+        moments = cv2.moments(contour)
+        centers.append(
+            [x + moments["m10"] / moments["m00"], y + moments["m01"] / moments["m00"]]
+        )
+    return np.array(centers, dtype=np.float32).reshape(-1, 2)
+
+
+class AutoCalibration:
+    """Per-face homographies from face coordinates to image pixels.
+
+    Sampling points are kept in face coordinates, so the manually calibrated
+    coordinates are reproduced exactly and follow the face when it moves.
+    Each homography is cached with the edge map of the face region it was
+    registered on. Every unrotated capture runs a phase correlation drift
+    check against that reference, and only re-registers the face when it
+    moved. Changes are written to the cache by `save_changes`, once per scan.
+    """
+
+    def __init__(
+        self,
+        homographies: dict[Face, np.ndarray],
+        facet_points: dict[Face, np.ndarray],
+        references: dict[Face, np.ndarray] = None,
+        rois: dict[Face, tuple[int, int, int, int]] = None,
+        cache_path: Path = HOMOGRAPHIES_PATH,
+    ):
+        self.homographies = homographies
+        self.facet_points = facet_points
+        self.references = references or {}
+        self.rois = rois or {}
+        self.cache_path = cache_path
+        # Whether a homography moved since the cache was written
+        self.changed = False
+        self.calibration = Calibration(
+            facet_coordinates={
+                face: facet_points_to_coordinates(homography, facet_points[face])
+                for face, homography in homographies.items()
+            }
+        )
+
+    @classmethod
+    def load(
+        cls, cache_path: Path = HOMOGRAPHIES_PATH, faces_path: Path = FACES_PATH
+    ) -> "AutoCalibration":
+        if not cache_path.exists():
+            logging.info("No cached homographies, fitting from manual calibration")
+            calibration = load_calibration(faces_path)
+            homographies, facet_points = {}, {}
+            for face, coordinates in calibration.facet_coordinates.items():
+                homographies[face] = fit_homography(coordinates)
+                facet_points[face] = coordinates_to_facet_points(
+                    homographies[face], coordinates
+                )
+            return cls(homographies, facet_points, cache_path=cache_path)
+
+        homographies, facet_points, references, rois = {}, {}, {}, {}
+        with np.load(cache_path) as data:
+            for face in Face:
+                if f"{face.value}_homography" not in data:
+                    continue
+                homographies[face] = data[f"{face.value}_homography"]
+                facet_points[face] = data[f"{face.value}_facet_points"]
+                if f"{face.value}_reference" in data:
+                    references[face] = data[f"{face.value}_reference"]
+                    rois[face] = tuple(int(v) for v in data[f"{face.value}_roi"])
+        return cls(homographies, facet_points, references, rois, cache_path)
+
+    def save(self):
+        data = {}
+        for face, homography in self.homographies.items():
+            data[f"{face.value}_homography"] = homography
+            data[f"{face.value}_facet_points"] = self.facet_points[face]
+            if face in self.references:
+                data[f"{face.value}_reference"] = self.references[face]
+                data[f"{face.value}_roi"] = np.array(self.rois[face])
+        np.savez_compressed(self.cache_path, **data)
+        self.changed = False
+
+    def save_changes(self):
+        if self.changed:
+            self.save()
+
+    def set_homography(self, face: Face, homography: np.ndarray, edges: np.ndarray):
+        self.homographies[face] = homography
+        self.calibration.facet_coordinates[face] = facet_points_to_coordinates(
+            homography, self.facet_points[face]
+        )
+        x, y, w, h = get_face_roi(homography, edges.shape)
+        self.rois[face] = (x, y, w, h)
+        self.references[face] = edges[y : y + h, x : x + w]
+
+    def check_drift(self, face: Face, edges: np.ndarray) -> tuple[float, float, float]:
+        """Return the (dx, dy) shift of the face since registration and confidence"""
+        x, y, w, h = self.rois[face]
+        current = edges[y : y + h, x : x + w]
+        reference = self.references[face]
+        if current.shape != reference.shape:
+            return 0.0, 0.0, 0.0
+        window = cv2.createHanningWindow((w, h), cv2.CV_32F)
+        (dx, dy), response = cv2.phaseCorrelate(reference, current, window)
+        return dx, dy, response
+
+    def get_shift(self, face: Face, homography: np.ndarray) -> float:
+        """Pixels the facet points of a face moved by since `homography`"""
+        points = self.facet_points[face]
+        moved = project(self.homographies[face], points) - project(homography, points)
+        return float(np.linalg.norm(moved, axis=1).max())
+
+    def register(self, face: Face, image: Image, edges: np.ndarray) -> bool:
+        """Refine the face homography from detected sticker centers"""
+        homography = self.homographies[face]
+        detected = detect_sticker_centers(image, homography)
+        if len(detected) < 4:
+            logging.warning(f"Found {len(detected)} stickers for {face=}")
+            return False
+
+        expected = project(homography, GRID_POINTS)
+        cell_size = np.linalg.norm(expected[1] - expected[0])
+        grid_points, image_points = [], []
+        for grid_point, point in zip(GRID_POINTS, expected, strict=True):
+            distances = np.linalg.norm(detected - point, axis=1)
+            nearest = np.argmin(distances)
+            if distances[nearest] < 0.4 * cell_size:
+                grid_points.append(grid_point)
+                image_points.append(detected[nearest])
+
+        if len(grid_points) < 4:
+            logging.warning(f"Matched {len(grid_points)} stickers for {face=}")
+            return False
+
+        refined, _ = cv2.findHomography(
+            np.array(grid_points), np.array(image_points), cv2.RANSAC, 0.1 * cell_size
+        )
+        if refined is None:
+            return False
+
+        self.set_homography(face, refined, edges)
+        return True
+
+    @timer
+    def update(self, position: Position, image: Image) -> bool:
+        """Check faces seen from `position` for drift, re-registering if needed"""
+        edges = get_edges(image)
+        changed = False
+        for face in POSITION_TO_FACES[position]:
+            if face not in self.references:
+                if not self.register(face, image, edges):
+                    self.set_homography(face, self.homographies[face], edges)
+                changed = True
+                continue
+
+            dx, dy, response = self.check_drift(face, edges)
+            if response < DRIFT_MIN_RESPONSE:
+                # The shift estimate is unreliable, only trust detected stickers
+                logging.info(f"Uncertain drift check for {face=}: {response=:.2f}")
+                previous = self.homographies[face]
+                if self.register(face, image, edges):
+                    changed |= self.get_shift(face, previous) >= DRIFT_TOLERANCE
+                continue
+
+            if np.hypot(dx, dy) < DRIFT_TOLERANCE:
+                continue
+
+            logging.info(f"Drift detected for {face=}: {dx=:.1f}, {dy=:.1f}")
+            translation = np.array([[1, 0, dx], [0, 1, dy], [0, 0, 1]])
+            shifted = translation @ self.homographies[face]
+            self.homographies[face] = shifted
+            if not self.register(face, image, edges):
+                self.set_homography(face, shifted, edges)
+            changed = True
+
+        self.changed |= changed
+        return changed
@@ -0,0 +1,122 @@
+import json
+import logging
+from dataclasses import asdict
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from rubiks_cube_solver.constants import CAMERAS_PATH, DEFAULT_CAMERA_CONFIG
+from rubiks_cube_solver.types import CameraConfig, Position
+from rubiks_cube_solver.utils import timer
+
+# V4L2 exposure menu values, passed through by OpenCV's V4L2 backend
+V4L2_EXPOSURE_MANUAL = 1
+V4L2_EXPOSURE_APERTURE_PRIORITY = 3
+
+
+def load_camera_configs(path: Path = CAMERAS_PATH) -> dict[Position, CameraConfig]:
+    configs = {position: DEFAULT_CAMERA_CONFIG for position in Position}
+    if not path.exists():
+        return configs
+
+    with open(path) as f:
+        data: dict[str, dict] = json.load(f)
+
+    for position_id, config in data.items():
+        configs[Position(position_id)] = CameraConfig(**config)
+    return configs
+
+
+def save_camera_config(
+    position: Position, config: CameraConfig, path: Path = CAMERAS_PATH
+):
+    """Save the config of one position, keeping the others in the file"""
+    if path.exists():
+        with open(path) as f:
+            data = json.load(f)
+    else:
+        data = {}
+
+    data[position.value] = asdict(config)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def configure_capture(cap: cv2.VideoCapture, config: CameraConfig):
+    # the pixel format must be set before the resolution to take effect
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.height)
+    cap.set(cv2.CAP_PROP_FPS, config.fps)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, config.buffer_size)
+
+    if config.exposure is None:
+        cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, V4L2_EXPOSURE_APERTURE_PRIORITY)
+    else:
+        cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, V4L2_EXPOSURE_MANUAL)
+        cap.set(cv2.CAP_PROP_EXPOSURE, config.exposure)
+
+    if config.white_balance is None:
+        cap.set(cv2.CAP_PROP_AUTO_WB, 1)
+    else:
+        cap.set(cv2.CAP_PROP_AUTO_WB, 0)
+        cap.set(cv2.CAP_PROP_WB_TEMPERATURE, config.white_balance)
+
+
+def get_capture_mode(cap: cv2.VideoCapture) -> dict:
+    """Read back the mode the driver actually negotiated"""
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    return {
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fourcc": fourcc.to_bytes(4, "little").decode(errors="replace"),
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+    }
+
+
+class Camera:
+    """A configured V4L2 capture, kept open between reads by default"""
+
+    def __init__(self, idx: int, config: CameraConfig = DEFAULT_CAMERA_CONFIG):
+        self.idx = idx
+        self.config = config
+        self.cap: cv2.VideoCapture = None
+
+    def open(self):
+        if self.cap is not None:
+            return
+
+        cap = cv2.VideoCapture(self.idx, cv2.CAP_V4L2)
+        if not cap.isOpened():
+            raise OSError(f"Unable to open webcam: {self.idx}")
+
+        configure_capture(cap, self.config)
+        logging.debug(f"Camera {self.idx} mode: {get_capture_mode(cap)}")
+        self.cap = cap
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    @timer
+    def read(self, flush: bool = True, dst: np.ndarray = None) -> np.ndarray:
+        """Read a frame, into `dst` when it has the frame's shape"""
+        self.open()
+        try:
+            # drop frames buffered before the request, e.g. before a move
+            for _ in range(self.config.flush_frames if flush else 0):
+                self.cap.grab()
+
+            ret, frame = self.cap.read(dst)
+        finally:
+            if not self.config.keep_open:
+                self.release()
+
+        if not ret:
+            raise OSError("Unable to read frame")
+
+        return frame
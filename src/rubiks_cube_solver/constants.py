@@ -1,25 +1,105 @@
 from collections.abc import Iterable
 from pathlib import Path
 
-from rubiks_cube_solver.types import Color, Face, Position
+from rubiks_cube_solver.types import CameraConfig, Color, Face, Position, RigConfig
 
 ROOT_PATH = Path(__file__).parent.parent.parent
 DEBUG_PATH = ROOT_PATH / "debug"
 COLORS_PATH = ROOT_PATH / "data" / "colors.json"
 FACES_PATH = ROOT_PATH / "data" / "faces.json"
 MODEL_PATH = ROOT_PATH / "data" / "model.joblib"
+HOMOGRAPHIES_PATH = ROOT_PATH / "data" / "homographies.npz"
+CAMERAS_PATH = ROOT_PATH / "data" / "cameras.json"
+CUBE_STATE_PATH = ROOT_PATH / "data" / "cube_state.json"
+RIGS_PATH = ROOT_PATH / "data" / "rigs.json"
+PATTERN_DATABASES_PATH = ROOT_PATH / "data" / "pattern_databases"
+SOLVER_BASELINE_PATH = ROOT_PATH / "data" / "solver_baseline.json"
 
 ARDUINO_PATH = (
     "/dev/serial/by-id/usb-Arduino__www.arduino.cc__0043_34331323036351400181-if00"
 )
 ARDUINO_BAUDRATE = 9600
+# Seconds to block on a single serial read
+ARDUINO_READ_TIMEOUT = 0.1
+# Seconds to wait for the ready status after connecting
+ARDUINO_READY_TIMEOUT = 5.0
+# Seconds to wait for the ack of each command, by prefix
+ARDUINO_COMMAND_TIMEOUTS: dict[str, float] = {
+    "MOVE:": 5.0,
+    "MOVES:": 5.0,
+    "LIGHT:": 1.0,
+    "JOG:": 1.0,
+    "SYNC:": 2.0,
+}
+# How many times to resync and retry a stalled command
+ARDUINO_MAX_RETRIES = 3
+
+# Motion profile, must match the Arduino sketch
+MOTOR_STEPS_PER_TURN = 100
+MOTOR_MAX_SPEED = 40000  # steps/s
+MOTOR_ACCELERATION = 40000  # steps/s^2
+# Seconds of serial round trip per command
+COMMAND_OVERHEAD = 0.03
+
+# Milliseconds to import each console script on a development machine, so
+# that moving a heavy import to module level shows up as a regression. The
+# solver and the CV stack are imported after the Arduino connects.
+STARTUP_BUDGETS_MS: dict[str, float] = {
+    "solve": 100,
+    "shuffle": 250,
+    "move": 100,
+    "jog": 100,
+    "soak": 250,
+    "replay": 250,
+    "orchestrate": 300,
+}
+
+SOLVERS = ["kociemba", "optimal"]
+# Search budget of the optimal solver before falling back to kociemba. The
+# search only finishes states up to about 10 moves from solved within it, so
+# the optimal solver is for short scrambles: deeper states spend the whole
+# budget and then fall back (see scripts/benchmark_solvers.py)
+OPTIMAL_MAX_NODES = 200_000
+OPTIMAL_TIME_LIMIT = 2.0  # s
+
 COLOR_NEIGHBORHOOD = 5
+# Faces to rescan one at a time when a scanned state is invalid, before
+# giving up on it
+MAX_FACE_RESCANS = 2
+# Seconds to wait for the facets to stop moving after a turn
+SETTLE_TIMEOUT = 0.5
+# Mean absolute pixel change of the facet patches between consecutive
+# frames below which they count as still
+SETTLE_THRESHOLD = 3.0
+# Consecutive still frames needed before a frame is used
+SETTLE_FRAMES = 2
+# Pixel shift beyond which a face is re-registered
+DRIFT_TOLERANCE = 2.0
+# Phase correlation response below which a drift check is inconclusive
+DRIFT_MIN_RESPONSE = 0.05
 
 POSITION_TO_CAMERA_IDX: dict[Position, int] = {
     Position.LOWER: 2,
     Position.UPPER: 0,
 }
 
+DEFAULT_RIG_CONFIG = RigConfig(
+    name="default",
+    arduino_path=ARDUINO_PATH,
+    camera_indices=POSITION_TO_CAMERA_IDX,
+    data_path=ROOT_PATH / "data",
+)
+
+# Resolution the facet coordinates are calibrated at, frames captured at
+# other resolutions are resized to it
+CALIBRATION_SIZE = (640, 480)
+# Images held at once by a scan: both base captures and a rotated one
+FRAME_POOL_SIZE = 3
+
+# Replaces scripts/set_v4l2_ctl: MJPEG at the calibrated resolution with
+# manual exposure, unless overridden per position in CAMERAS_PATH
+DEFAULT_CAMERA_CONFIG = CameraConfig()
+
 POSITION_TO_FACES: dict[Position, Iterable[Face]] = {
     Position.UPPER: [Face.UP, Face.LEFT, Face.FRONT],
     Position.LOWER: [Face.RIGHT, Face.BACK, Face.DOWN],
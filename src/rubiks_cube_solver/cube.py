@@ -0,0 +1,237 @@
+from typing import Optional
+
+import numpy as np
+
+from rubiks_cube_solver.move import MOVES, Moves, as_moves
+
+# Facelet string layout expected by kociemba:
+# U1..U9, R1..R9, F1..F9, D1..D9, L1..L9, B1..B9
+FACE_ORDER = ["U", "R", "F", "D", "L", "B"]
+NUM_FACELETS = 54
+SOLVED_STATE = "".join(face * 9 for face in FACE_ORDER)
+
+
+def _facelet(name: str) -> int:
+    return 9 * FACE_ORDER.index(name[0]) + int(name[1]) - 1
+
+
+# Corner positions: URF, UFL, ULB, UBR, DFR, DLF, DBL, DRB
+CORNER_FACELETS = [
+    [_facelet(f) for f in corner]
+    for corner in [
+        ["U9", "R1", "F3"],
+        ["U7", "F1", "L3"],
+        ["U1", "L1", "B3"],
+        ["U3", "B1", "R3"],
+        ["D3", "F9", "R7"],
+        ["D1", "L9", "F7"],
+        ["D7", "B9", "L7"],
+        ["D9", "R9", "B7"],
+    ]
+]
+CORNER_COLORS = ["URF", "UFL", "ULB", "UBR", "DFR", "DLF", "DBL", "DRB"]
+
+# Edge positions: UR, UF, UL, UB, DR, DF, DL, DB, FR, FL, BL, BR
+EDGE_FACELETS = [
+    [_facelet(f) for f in edge]
+    for edge in [
+        ["U6", "R2"],
+        ["U8", "F2"],
+        ["U4", "L2"],
+        ["U2", "B2"],
+        ["D6", "R8"],
+        ["D2", "F8"],
+        ["D4", "L8"],
+        ["D8", "B8"],
+        ["F6", "R4"],
+        ["F4", "L6"],
+        ["B6", "L4"],
+        ["B4", "R6"],
+    ]
+]
+EDGE_COLORS = ["UR", "UF", "UL", "UB", "DR", "DF", "DL", "DB", "FR", "FL", "BL", "BR"]
+
+CENTER_FACELETS = [9 * i + 4 for i in range(len(FACE_ORDER))]
+
+# Quarter turn of each face on the cubie level, using the "replaced by"
+# convention: position i receives the cubie previously at position cp[i]
+# (and likewise for edges), twisted by co[i] / flipped by eo[i].
+BASIC_MOVES: dict[str, tuple[list[int], list[int], list[int], list[int]]] = {
+    "U": (
+        [3, 0, 1, 2, 4, 5, 6, 7],
+        [0, 0, 0, 0, 0, 0, 0, 0],
+        [3, 0, 1, 2, 4, 5, 6, 7, 8, 9, 10, 11],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ),
+    "R": (
+        [4, 1, 2, 0, 7, 5, 6, 3],
+        [2, 0, 0, 1, 1, 0, 0, 2],
+        [8, 1, 2, 3, 11, 5, 6, 7, 4, 9, 10, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ),
+    "F": (
+        [1, 5, 2, 3, 0, 4, 6, 7],
+        [1, 2, 0, 0, 2, 1, 0, 0],
+        [0, 9, 2, 3, 4, 8, 6, 7, 1, 5, 10, 11],
+        [0, 1, 0, 0, 0, 1, 0, 0, 1, 1, 0, 0],
+    ),
+    "D": (
+        [0, 1, 2, 3, 5, 6, 7, 4],
+        [0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 1, 2, 3, 5, 6, 7, 4, 8, 9, 10, 11],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ),
+    "L": (
+        [0, 2, 6, 3, 4, 1, 5, 7],
+        [0, 1, 2, 0, 0, 2, 1, 0],
+        [0, 1, 10, 3, 4, 5, 9, 7, 8, 2, 6, 11],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ),
+    "B": (
+        [0, 1, 3, 7, 4, 5, 2, 6],
+        [0, 0, 1, 2, 0, 0, 2, 1],
+        [0, 1, 2, 11, 4, 5, 6, 10, 8, 9, 3, 7],
+        [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 1, 1],
+    ),
+}
+
+
+def _quarter_turn_permutation(face: str) -> np.ndarray:
+    cp, co, ep, eo = BASIC_MOVES[face]
+    permutation = np.arange(NUM_FACELETS)
+    for i in range(len(CORNER_FACELETS)):
+        for n in range(3):
+            target = CORNER_FACELETS[i][(n + co[i]) % 3]
+            permutation[target] = CORNER_FACELETS[cp[i]][n]
+    for i in range(len(EDGE_FACELETS)):
+        for n in range(2):
+            target = EDGE_FACELETS[i][(n + eo[i]) % 2]
+            permutation[target] = EDGE_FACELETS[ep[i]][n]
+    return permutation
+
+
+def _build_move_permutations() -> dict[str, np.ndarray]:
+    permutations: dict[str, np.ndarray] = {}
+    for face in FACE_ORDER:
+        quarter = _quarter_turn_permutation(face)
+        half = quarter[quarter]
+        inverse = half[quarter]
+        permutations[face] = quarter
+        permutations[f"{face}'"] = inverse
+        permutations[f"{face}2"] = half
+        permutations[f"{face}2'"] = half
+    return permutations
+
+
+# Facelet permutation for every move string: `new = old[permutation]`
+MOVE_PERMUTATIONS = _build_move_permutations()
+# The same permutations indexed by move code
+CODE_PERMUTATIONS = np.stack([MOVE_PERMUTATIONS[move] for move in MOVES])
+
+
+def to_facelets(cube_state: str) -> np.ndarray:
+    return np.frombuffer(cube_state.encode("ascii"), dtype=np.uint8).copy()
+
+
+def from_facelets(facelets: np.ndarray) -> str:
+    return facelets.astype(np.uint8).tobytes().decode("ascii")
+
+
+def get_moves_permutation(moves: Moves) -> np.ndarray:
+    permutation = np.arange(NUM_FACELETS)
+    for code in as_moves(moves):
+        permutation = permutation[CODE_PERMUTATIONS[code]]
+    return permutation
+
+
+def apply_moves(cube_state: str, moves: Moves) -> str:
+    facelets = to_facelets(cube_state)
+    return from_facelets(facelets[get_moves_permutation(moves)])
+
+
+def is_solved(cube_state: str) -> bool:
+    return all(len(set(cube_state[i : i + 9])) == 1 for i in range(0, NUM_FACELETS, 9))
+
+
+def permutation_parity(permutation: np.ndarray) -> int:
+    parity = 0
+    for i in range(len(permutation)):
+        for j in range(i + 1, len(permutation)):
+            if permutation[i] > permutation[j]:
+                parity ^= 1
+    return parity
+
+
+def cubies_to_state(
+    cp: np.ndarray, co: np.ndarray, ep: np.ndarray, eo: np.ndarray
+) -> str:
+    facelets = ["" for _ in range(NUM_FACELETS)]
+    for i, center in enumerate(CENTER_FACELETS):
+        facelets[center] = FACE_ORDER[i]
+    for i in range(len(CORNER_FACELETS)):
+        for n in range(3):
+            facelets[CORNER_FACELETS[i][(n + co[i]) % 3]] = CORNER_COLORS[cp[i]][n]
+    for i in range(len(EDGE_FACELETS)):
+        for n in range(2):
+            facelets[EDGE_FACELETS[i][(n + eo[i]) % 2]] = EDGE_COLORS[ep[i]][n]
+    return "".join(facelets)
+
+
+def read_corner(cube_state: str, i: int) -> Optional[tuple[int, int]]:
+    """Cubie and twist of the corner at position i, None if it cannot exist"""
+    colors = [cube_state[f] for f in CORNER_FACELETS[i]]
+    twists = [n for n, color in enumerate(colors) if color in "UD"]
+    if len(twists) != 1:
+        return None
+    cubie = "".join(colors[(n + twists[0]) % 3] for n in range(3))
+    if cubie not in CORNER_COLORS:
+        return None
+    return CORNER_COLORS.index(cubie), twists[0]
+
+
+def read_edge(cube_state: str, i: int) -> Optional[tuple[int, int]]:
+    """Cubie and flip of the edge at position i, None if it cannot exist"""
+    colors = [cube_state[f] for f in EDGE_FACELETS[i]]
+    for flip in range(2):
+        cubie = colors[flip] + colors[1 - flip]
+        if cubie in EDGE_COLORS:
+            return EDGE_COLORS.index(cubie), flip
+    return None
+
+
+def state_to_cubies(
+    cube_state: str,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Inverse of `cubies_to_state`, raising ValueError for impossible cubies"""
+    cp, co = np.zeros(8, dtype=int), np.zeros(8, dtype=int)
+    for i, facelets in enumerate(CORNER_FACELETS):
+        corner = read_corner(cube_state, i)
+        if corner is None:
+            colors = [cube_state[f] for f in facelets]
+            raise ValueError(f"Invalid corner at {CORNER_COLORS[i]}: {colors}")
+        cp[i], co[i] = corner
+
+    ep, eo = np.zeros(12, dtype=int), np.zeros(12, dtype=int)
+    for i, facelets in enumerate(EDGE_FACELETS):
+        edge = read_edge(cube_state, i)
+        if edge is None:
+            colors = [cube_state[f] for f in facelets]
+            raise ValueError(f"Invalid edge at {EDGE_COLORS[i]}: {colors}")
+        ep[i], eo[i] = edge
+
+    return cp, co, ep, eo
+
+
+def random_cube_state(rng: np.random.Generator) -> str:
+    """Sample a cube state uniformly from all reachable states"""
+    cp = rng.permutation(8)
+    ep = rng.permutation(12)
+    if permutation_parity(cp) != permutation_parity(ep):
+        ep[[10, 11]] = ep[[11, 10]]
+
+    co = rng.integers(0, 3, size=8)
+    co[-1] = -co[:-1].sum() % 3
+    eo = rng.integers(0, 2, size=12)
+    eo[-1] = eo[:-1].sum() % 2
+
+    return cubies_to_state(cp, co, ep, eo)
@@ -37,8 +37,8 @@ def get_rgb(idx: int):
     return frame
 
 
-def rgb_to_hsv(image):
-    return cv2.cvtColor(image, cv2.COLOR_RGB2HSV)
+def rgb_to_hsv(image, dst=None):
+    return cv2.cvtColor(image, cv2.COLOR_RGB2HSV, dst=dst)
 
 
 def mask_by_hsv(img: Image, lower_hsv, upper_hsv, mask_color=(0, 0, 0)):
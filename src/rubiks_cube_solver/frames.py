@@ -0,0 +1,58 @@
+import logging
+
+import numpy as np
+
+from rubiks_cube_solver.constants import CALIBRATION_SIZE, FRAME_POOL_SIZE
+from rubiks_cube_solver.types import Image
+
+
+class FramePool:
+    """Preallocated frame and HSV buffers, lent out one capture at a time.
+
+    Images borrowed from the pool are views into its buffers, so they are
+    only valid until `release`. The pool grows when more images are
+    borrowed at once than it holds, and never shrinks.
+    """
+
+    def __init__(self, size: int = FRAME_POOL_SIZE, frame_size=CALIBRATION_SIZE):
+        self.shape = (frame_size[1], frame_size[0], 3)
+        self.rgb = [np.empty(self.shape, dtype=np.uint8) for _ in range(size)]
+        self.hsv = [np.empty(self.shape, dtype=np.uint8) for _ in range(size)]
+        self.free = list(range(size))
+        self.borrowed: dict[int, Image] = {}
+        # Frames read at another resolution than the pool's, by camera
+        self.capture_buffers: dict[object, np.ndarray] = {}
+        # Annotation canvas for debug output
+        self.scratch = np.empty(self.shape, dtype=np.uint8)
+        self.peak_borrowed = 0
+
+    def borrow(self) -> Image:
+        if not self.free:
+            logging.debug(f"Frame pool exhausted, growing to {len(self.rgb) + 1}")
+            self.free.append(len(self.rgb))
+            self.rgb.append(np.empty(self.shape, dtype=np.uint8))
+            self.hsv.append(np.empty(self.shape, dtype=np.uint8))
+
+        idx = self.free.pop()
+        image = Image(rgb=self.rgb[idx], hsv=self.hsv[idx])
+        self.borrowed[idx] = image
+        self.peak_borrowed = max(self.peak_borrowed, len(self.borrowed))
+        return image
+
+    def release(self, image: Image):
+        for idx, borrowed in self.borrowed.items():
+            if borrowed is image:
+                del self.borrowed[idx]
+                self.free.append(idx)
+                return
+        raise ValueError("Image is not borrowed from this pool")
+
+    def reset_peak(self):
+        self.peak_borrowed = len(self.borrowed)
+
+    @property
+    def peak_bytes(self) -> int:
+        """Frame memory in use at the peak since `reset_peak`"""
+        image_bytes = 2 * np.prod(self.shape)
+        capture_bytes = sum(frame.nbytes for frame in self.capture_buffers.values())
+        return int(self.peak_borrowed * image_bytes + capture_bytes)
@@ -1,33 +1,177 @@
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Union
+
 import numpy as np
 
+MOVE_FACES = ["U", "R", "F", "D", "L", "B"]
+MOVE_SUFFIXES = ["", "'", "2", "2'"]
+
+# Integer move codes: code = 4 * face index + suffix index. Bit 1 of the
+# code is set for half turns and bit 0 for counterclockwise turns, so
+# inverting a move flips bit 0.
+MOVES = [f"{face}{suffix}" for face in MOVE_FACES for suffix in MOVE_SUFFIXES]
+MOVE_TO_CODE = {move: code for code, move in enumerate(MOVES)}
+# Pads variable length scrambles (e.g. random-state) in fixed width arrays
+MOVE_PAD = 255
+# Longest solution kociemba returns (its default max_depth), and so the
+# narrowest width that fits any random-state scramble
+KOCIEMBA_MAX_DEPTH = 24
+
+# A single move or a sequence of moves, as strings or codes. Sequences are
+# kept as uint8 code arrays, strings are only for kociemba and serial.
+Move = Union[str, int]
+Moves = Union[Iterable[str], Iterable[int], np.ndarray]
+
+
+def get_rng(random_seed: int = None) -> np.random.Generator:
+    return np.random.default_rng(random_seed)
+
+
+def generate_scrambles(
+    num_scrambles: int, num_moves: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Generate random-move scrambles as a (num_scrambles, num_moves) code array"""
+    # we make sure not to repeat the same face in consecutive moves: each
+    # face is offset from the previous one by 1-5 (mod 6), i.e. uniformly
+    # chosen among the five other faces
+    first_faces = rng.integers(0, len(MOVE_FACES), size=(num_scrambles, 1))
+    offsets = rng.integers(
+        1, len(MOVE_FACES), size=(num_scrambles, max(num_moves - 1, 0))
+    )
+    faces = np.cumsum(np.concatenate([first_faces, offsets], axis=1), axis=1)
+    faces = faces[:, :num_moves] % len(MOVE_FACES)
+
+    suffixes = rng.integers(0, len(MOVE_SUFFIXES), size=(num_scrambles, num_moves))
+
+    return (len(MOVE_SUFFIXES) * faces + suffixes).astype(np.uint8)
+
+
+def get_scramble_width(num_moves: int, random_state: bool = False) -> int:
+    """Columns of a scramble array, random-state scrambles can be as long as
+    any kociemba solution"""
+    if random_state:
+        return max(num_moves, KOCIEMBA_MAX_DEPTH)
+    return num_moves
+
+
+def generate_random_state_scrambles(
+    num_scrambles: int, num_moves: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Generate scrambles reaching uniformly random cube states.
+
+    Each scramble is the inverted kociemba solution of a random state, padded
+    with `MOVE_PAD` up to `get_scramble_width(num_moves, random_state=True)`.
+    """
+    from rubiks_cube_solver.cube import random_cube_state
+    from rubiks_cube_solver.solver import solve
+
+    width = get_scramble_width(num_moves, random_state=True)
+    scrambles = np.full((num_scrambles, width), MOVE_PAD, dtype=np.uint8)
+    for i in range(num_scrambles):
+        scramble = invert_moves(solve(random_cube_state(rng)))
+        scrambles[i, : len(scramble)] = scramble
+    return scrambles
+
+
+def encode_moves(moves: Iterable[str]) -> np.ndarray:
+    try:
+        return np.array([MOVE_TO_CODE[move] for move in moves], dtype=np.uint8)
+    except KeyError as e:
+        raise ValueError(f"Unknown move: {e}") from None
+
+
+def decode_moves(codes: np.ndarray) -> list[str]:
+    return [MOVES[code] for code in codes if code != MOVE_PAD]
+
+
+def validate_moves(codes: np.ndarray):
+    invalid = codes[codes >= len(MOVES)]
+    if len(invalid):
+        raise ValueError(f"Invalid move codes: {np.unique(invalid)}")
+
+
+def as_moves(moves: Moves) -> np.ndarray:
+    """Convert moves to a validated code array, dropping any padding"""
+    if not isinstance(moves, np.ndarray):
+        moves = list(moves)
+        if not all(isinstance(move, (int, np.integer)) for move in moves):
+            return encode_moves(moves)
+        # a sequence of codes, checked before the cast can wrap them around
+        moves = np.array(moves, dtype=np.int64)
+        if ((moves < 0) | (moves > MOVE_PAD)).any():
+            raise ValueError(f"Invalid move codes: {moves}")
+    codes = moves[moves != MOVE_PAD].astype(np.uint8)
+    validate_moves(codes)
+    return codes
+
+
+def to_move_string(move: Move) -> str:
+    if isinstance(move, str):
+        return move
+    return MOVES[move]
+
+
+def get_move_code(face: str, suffix: str = "") -> int:
+    return len(MOVE_SUFFIXES) * MOVE_FACES.index(face) + MOVE_SUFFIXES.index(suffix)
+
+
+def get_move_faces(codes: np.ndarray) -> np.ndarray:
+    """Face index of each move, opposite faces are 3 apart"""
+    return codes >> 2
+
+
+def get_move_amounts(codes: np.ndarray) -> np.ndarray:
+    """Quarter turns made by each move: 1 or 2"""
+    return 1 + ((codes >> 1) & 1)
+
+
+def get_move_directions(codes: np.ndarray) -> np.ndarray:
+    """1 for clockwise moves, -1 for counterclockwise ones"""
+    return 1 - 2 * (codes & 1).astype(np.int8)
+
+
+def concatenate_moves(*sequences: Moves) -> np.ndarray:
+    return np.concatenate([as_moves(moves) for moves in sequences])
+
+
+def save_scramble_corpus(
+    path: Path,
+    num_scrambles: int,
+    num_moves: int,
+    random_seed: int = None,
+    random_state: bool = False,
+    chunk_size: int = 100_000,
+):
+    """Stream a scramble corpus to a `.npy` file in chunks"""
+    rng = get_rng(random_seed)
+    generate = generate_random_state_scrambles if random_state else generate_scrambles
+
+    corpus = np.lib.format.open_memmap(
+        path,
+        mode="w+",
+        dtype=np.uint8,
+        shape=(num_scrambles, get_scramble_width(num_moves, random_state)),
+    )
+    for start in range(0, num_scrambles, chunk_size):
+        end = min(start + chunk_size, num_scrambles)
+        corpus[start:end] = generate(end - start, num_moves, rng)
+    corpus.flush()
+    del corpus
 
-def get_random_moves(num_moves: int, random_seed: int = None):
-    if random_seed:
-        np.random.seed(random_seed)
 
-    faces = {"L", "F", "R", "D", "U", "B"}
-    counts = ["", "2"]
-    inversions = ["", "'"]
+def load_scramble_corpus(path: Path) -> np.ndarray:
+    return np.load(path, mmap_mode="r")
 
-    commands, last_face = [], ""
-    for _ in range(num_moves):
-        # we make sure not to repeat the same face in consecutive moves
-        face = np.random.choice(sorted(faces.difference(last_face)))
-        count = np.random.choice(counts)
-        inverted = np.random.choice(inversions)
-        commands.append(f"{face}{count}{inverted}")
-        last_face = face
 
-    return commands
+def get_random_moves(num_moves: int, random_seed: int = None) -> np.ndarray:
+    return generate_scrambles(1, num_moves, get_rng(random_seed))[0]
 
 
-def invert_move(move: str):
-    if move.endswith("'"):
-        return move[:-1]
-    return move + "'"
+def invert_moves(moves: Moves) -> np.ndarray:
+    return as_moves(moves)[::-1] ^ 1
 
 
 def get_random_resolving_moves(num_moves: int, random_seed: int = None):
-    commands = get_random_moves(num_moves=num_moves, random_seed=random_seed)
-    commands = commands + list(reversed([invert_move(c) for c in commands]))
-    return commands
+    moves = get_random_moves(num_moves=num_moves, random_seed=random_seed)
+    return concatenate_moves(moves, invert_moves(moves))
@@ -0,0 +1,336 @@
+import itertools
+import logging
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from rubiks_cube_solver.constants import PATTERN_DATABASES_PATH
+from rubiks_cube_solver.cube import (
+    BASIC_MOVES,
+    FACE_ORDER,
+    SOLVED_STATE,
+    state_to_cubies,
+)
+from rubiks_cube_solver.move import encode_moves
+
+# Moves searched by IDA*: code = 3 * face index + (quarter, half, inverse)
+OPTIMAL_MOVES = [f"{face}{suffix}" for face in FACE_ORDER for suffix in ["", "2", "'"]]
+NUM_MOVES = len(OPTIMAL_MOVES)
+OPTIMAL_MOVE_CODES = encode_moves(OPTIMAL_MOVES)
+
+NUM_CORNER_TWISTS = 3**7
+# The edges are split into two groups of six, each with its own database
+EDGE_GROUPS = [(0, 1, 2, 3, 4, 5), (6, 7, 8, 9, 10, 11)]
+NUM_EDGE_FLIPS = 2**6
+
+UNVISITED = 255
+
+
+def _multiply(a: tuple, b: tuple) -> tuple:
+    """Cubie-level product `a * b`, i.e. `b` applied after `a`"""
+    cp_a, co_a, ep_a, eo_a = a
+    cp_b, co_b, ep_b, eo_b = b
+    return (
+        cp_a[cp_b],
+        (co_a[cp_b] + co_b) % 3,
+        ep_a[ep_b],
+        (eo_a[ep_b] + eo_b) % 2,
+    )
+
+
+def get_cubie_moves() -> list[tuple[np.ndarray, ...]]:
+    cubie_moves = []
+    for face in FACE_ORDER:
+        quarter = tuple(np.array(x) for x in BASIC_MOVES[face])
+        half = _multiply(quarter, quarter)
+        cubie_moves += [quarter, half, _multiply(half, quarter)]
+    return cubie_moves
+
+
+def rank_arrangements(positions: np.ndarray, num_slots: int) -> np.ndarray:
+    """Rank (n, k) arrays of distinct slots among `num_slots` into 0..N!/(N-k)!"""
+    rank = np.zeros(len(positions), dtype=np.int64)
+    for j in range(positions.shape[1]):
+        smaller = (positions[:, :j] < positions[:, j : j + 1]).sum(axis=1)
+        rank = rank * (num_slots - j) + positions[:, j] - smaller
+    return rank
+
+
+def encode_twists(co: np.ndarray) -> np.ndarray:
+    return co[:, :7] @ (3 ** np.arange(7))
+
+
+def decode_twists(coords: np.ndarray) -> np.ndarray:
+    co = (coords[:, None] // 3 ** np.arange(7)) % 3
+    return np.concatenate([co, -co.sum(axis=1, keepdims=True) % 3], axis=1)
+
+
+def get_corner_move_tables() -> tuple[np.ndarray, np.ndarray]:
+    """Move tables for the corner permutation and twist coordinates"""
+    permutations = np.array(list(itertools.permutations(range(8))))
+    permutations = permutations[np.argsort(rank_arrangements(permutations, 8))]
+    twists = decode_twists(np.arange(NUM_CORNER_TWISTS))
+
+    permutation_table = np.zeros((len(permutations), NUM_MOVES), dtype=np.uint16)
+    twist_table = np.zeros((NUM_CORNER_TWISTS, NUM_MOVES), dtype=np.uint16)
+    for m, (cp, co, _, _) in enumerate(get_cubie_moves()):
+        permutation_table[:, m] = rank_arrangements(permutations[:, cp], 8)
+        twist_table[:, m] = encode_twists((twists[:, cp] + co) % 3)
+    return permutation_table, twist_table
+
+
+def get_edge_move_tables() -> tuple[np.ndarray, np.ndarray]:
+    """Move tables for the positions of a group of six edges and their flips.
+
+    Flips are tracked per piece, so a move's flips depend on where the pieces
+    are and are stored as an XOR mask alongside the new position rank.
+    """
+    positions = np.array(list(itertools.permutations(range(12), 6)))
+    positions = positions[np.argsort(rank_arrangements(positions, 12))]
+
+    position_table = np.zeros((len(positions), NUM_MOVES), dtype=np.int32)
+    flip_table = np.zeros((len(positions), NUM_MOVES), dtype=np.uint8)
+    for m, (_, _, ep, eo) in enumerate(get_cubie_moves()):
+        # the piece at position p moves to the position that is replaced by p
+        destinations = np.argsort(ep)[positions]
+        position_table[:, m] = rank_arrangements(destinations, 12)
+        flip_table[:, m] = eo[destinations] @ (1 << np.arange(6))
+    return position_table, flip_table
+
+
+def get_corner_index(cp: np.ndarray, co: np.ndarray) -> int:
+    rank = rank_arrangements(cp[None], 8)[0]
+    return int(rank * NUM_CORNER_TWISTS + encode_twists(co[None])[0])
+
+
+def get_edge_index(ep: np.ndarray, eo: np.ndarray, group: tuple[int, ...]) -> int:
+    positions = np.array([np.flatnonzero(ep == piece)[0] for piece in group])
+    rank = rank_arrangements(positions[None], 12)[0]
+    flips = int(eo[positions] @ (1 << np.arange(6)))
+    return int(rank * NUM_EDGE_FLIPS + flips)
+
+
+def get_corner_neighbors(indices: np.ndarray, tables: tuple) -> np.ndarray:
+    permutation_table, twist_table = tables
+    ranks, twists = np.divmod(indices, NUM_CORNER_TWISTS)
+    return (
+        permutation_table[ranks].astype(np.int64) * NUM_CORNER_TWISTS
+        + twist_table[twists]
+    )
+
+
+def get_edge_neighbors(indices: np.ndarray, tables: tuple) -> np.ndarray:
+    position_table, flip_table = tables
+    ranks, flips = np.divmod(indices, NUM_EDGE_FLIPS)
+    return position_table[ranks].astype(np.int64) * NUM_EDGE_FLIPS + (
+        flips[:, None] ^ flip_table[ranks]
+    )
+
+
+def generate_distances(
+    size: int, start: int, get_neighbors, tables: tuple, chunk_size: int = 1 << 21
+) -> np.ndarray:
+    """Breadth-first search over a coordinate, returning move distances"""
+    distances = np.full(size, UNVISITED, dtype=np.uint8)
+    distances[start] = 0
+    depth = 0
+    while True:
+        frontier = np.flatnonzero(distances == depth)
+        for start_idx in range(0, len(frontier), chunk_size):
+            neighbors = get_neighbors(
+                frontier[start_idx : start_idx + chunk_size], tables
+            ).ravel()
+            neighbors = neighbors[distances[neighbors] == UNVISITED]
+            distances[neighbors] = depth + 1
+        num_new = np.count_nonzero(distances == depth + 1)
+        logging.info(f"Depth {depth + 1}: {num_new} states")
+        if num_new == 0:
+            return distances
+        depth += 1
+
+
+def pack_distances(distances: np.ndarray) -> np.ndarray:
+    """Pack distances (all < 16) two per byte"""
+    distances = np.append(distances, np.uint8(0)) if len(distances) % 2 else distances
+    return distances[0::2] | (distances[1::2] << 4)
+
+
+def lookup_distances(packed: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    return (packed[indices >> 1] >> ((indices & 1) << 2)) & 15
+
+
+def generate_pattern_databases(path: Path = PATTERN_DATABASES_PATH):
+    """Generate the move tables and pattern databases (run once, slow)"""
+    path.mkdir(parents=True, exist_ok=True)
+
+    corner_tables = get_corner_move_tables()
+    edge_tables = get_edge_move_tables()
+    np.save(path / "corner_permutation_table.npy", corner_tables[0])
+    np.save(path / "corner_twist_table.npy", corner_tables[1])
+    np.save(path / "edge_position_table.npy", edge_tables[0])
+    np.save(path / "edge_flip_table.npy", edge_tables[1])
+
+    logging.info("Generating corner pattern database")
+    solved = state_to_cubies(SOLVED_STATE)
+    corners = generate_distances(
+        len(corner_tables[0]) * NUM_CORNER_TWISTS,
+        get_corner_index(solved[0], solved[1]),
+        get_corner_neighbors,
+        corner_tables,
+    )
+    np.save(path / "corners.npy", pack_distances(corners))
+    del corners
+
+    for i, group in enumerate(EDGE_GROUPS):
+        logging.info(f"Generating edge pattern database for edges {group}")
+        edges = generate_distances(
+            len(edge_tables[0]) * NUM_EDGE_FLIPS,
+            get_edge_index(solved[2], solved[3], group),
+            get_edge_neighbors,
+            edge_tables,
+        )
+        np.save(path / f"edges_{i}.npy", pack_distances(edges))
+
+
+class PatternDatabases:
+    """Read-only, memory-mapped move tables and pattern databases.
+
+    The files are mapped rather than read, so processes solving at the same
+    time share one copy through the page cache.
+    """
+
+    def __init__(self, path: Path = PATTERN_DATABASES_PATH):
+        if not (path / "corners.npy").exists():
+            raise FileNotFoundError(
+                f"No pattern databases in {path}, run generate_pattern_databases"
+            )
+
+        def load(name: str) -> np.ndarray:
+            return np.load(path / f"{name}.npy", mmap_mode="r")
+
+        self.corner_tables = (
+            load("corner_permutation_table"),
+            load("corner_twist_table"),
+        )
+        self.edge_tables = (load("edge_position_table"), load("edge_flip_table"))
+        self.corners = load("corners")
+        self.edges = [load(f"edges_{i}") for i in range(len(EDGE_GROUPS))]
+
+
+_pattern_databases: Optional[PatternDatabases] = None
+
+
+def get_pattern_databases() -> PatternDatabases:
+    global _pattern_databases
+    if _pattern_databases is None:
+        _pattern_databases = PatternDatabases()
+    return _pattern_databases
+
+
+class SearchBudgetExceeded(Exception):
+    pass
+
+
+# Never turn the same face twice in a row, and turn opposite faces in one
+# order only (faces 3-5 are opposite faces 0-2)
+_ALLOWED_AFTER = np.ones((len(FACE_ORDER) + 1, NUM_MOVES), dtype=bool)
+for _face in range(len(FACE_ORDER)):
+    _ALLOWED_AFTER[_face, 3 * _face : 3 * _face + 3] = False
+    if _face >= 3:
+        _ALLOWED_AFTER[_face, 3 * (_face - 3) : 3 * (_face - 3) + 3] = False
+
+
+class IDAStar:
+    def __init__(
+        self,
+        databases: PatternDatabases,
+        max_nodes: int = None,
+        time_limit: float = None,
+    ):
+        self.databases = databases
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.num_nodes = 0
+
+    def get_children(self, corner: int, edges: tuple[int, ...]):
+        db = self.databases
+        corners = get_corner_neighbors(np.array([corner]), db.corner_tables)[0]
+        heuristic = lookup_distances(db.corners, corners)
+        children = []
+        for i, edge in enumerate(edges):
+            children.append(get_edge_neighbors(np.array([edge]), db.edge_tables)[0])
+            heuristic = np.maximum(
+                heuristic, lookup_distances(db.edges[i], children[i])
+            )
+        return corners, children, heuristic
+
+    def search(
+        self, corner: int, edges: tuple, depth: int, bound: int, last_face: int
+    ) -> Optional[list[int]]:
+        self.num_nodes += 1
+        if self.num_nodes % 1024 == 0:
+            self.check_budget()
+
+        corners, children, heuristic = self.get_children(corner, edges)
+        candidates = np.flatnonzero(
+            _ALLOWED_AFTER[last_face] & (depth + 1 + heuristic <= bound)
+        )
+        for m in candidates[np.argsort(heuristic[candidates], kind="stable")]:
+            if heuristic[m] == 0:
+                return [int(m)]
+            solution = self.search(
+                int(corners[m]),
+                tuple(int(child[m]) for child in children),
+                depth + 1,
+                bound,
+                int(m) // 3,
+            )
+            if solution is not None:
+                return [int(m)] + solution
+        return None
+
+    def check_budget(self):
+        if self.max_nodes is not None and self.num_nodes > self.max_nodes:
+            raise SearchBudgetExceeded(f"Searched more than {self.max_nodes} nodes")
+        if self.time_limit is not None:
+            if time.perf_counter() - self.start_time > self.time_limit:
+                raise SearchBudgetExceeded(f"Searched longer than {self.time_limit}s")
+
+    def solve(self, cube_state: str) -> np.ndarray:
+        self.start_time = time.perf_counter()
+        self.num_nodes = 0
+
+        cp, co, ep, eo = state_to_cubies(cube_state)
+        corner = get_corner_index(cp, co)
+        edges = tuple(get_edge_index(ep, eo, group) for group in EDGE_GROUPS)
+        bound = max(
+            lookup_distances(self.databases.corners, np.array([corner]))[0],
+            *(
+                lookup_distances(db, np.array([edge]))[0]
+                for db, edge in zip(self.databases.edges, edges)
+            ),
+        )
+        if bound == 0:
+            return OPTIMAL_MOVE_CODES[[]]
+
+        while True:
+            logging.debug(f"IDA* bound {bound}, {self.num_nodes} nodes so far")
+            solution = self.search(corner, edges, 0, bound, len(FACE_ORDER))
+            if solution is not None:
+                return OPTIMAL_MOVE_CODES[solution]
+            bound += 1
+
+
+def solve_optimal(
+    cube_state: str, max_nodes: int = None, time_limit: float = None
+) -> np.ndarray:
+    """Find a shortest solution with IDA*, raising SearchBudgetExceeded if the
+    node or time budget runs out first"""
+    search = IDAStar(get_pattern_databases(), max_nodes, time_limit)
+    solution = search.solve(cube_state)
+    logging.debug(
+        f"Optimal solution of {len(solution)} moves, {search.num_nodes} nodes"
+    )
+    return solution
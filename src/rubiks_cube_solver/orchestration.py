@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+)
+from pathlib import Path
+
+import numpy as np
+
+from rubiks_cube_solver.move import Moves, generate_scrambles
+from rubiks_cube_solver.rig import Rig
+from rubiks_cube_solver.schedule import get_schedule_report, schedule_moves
+from rubiks_cube_solver.soak import SoakStats, Timed, write_summary
+from rubiks_cube_solver.solver import solve, warm_up_solver
+
+
+class RigThread(Executor):
+    """Runs calls one at a time on a single daemon thread.
+
+    ThreadPoolExecutor threads are joined at interpreter exit even after
+    `shutdown(wait=False)`, so a call that never returns (e.g. a hung
+    camera read) would keep the process alive. A daemon thread is simply
+    abandoned when the process exits.
+    """
+
+    def __init__(self, name: str):
+        self.calls: queue.SimpleQueue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.work, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        self.calls.put((future, fn, args, kwargs))
+        return future
+
+    def work(self):
+        while (call := self.calls.get()) is not None:
+            future, fn, args, kwargs = call
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:  # noqa: BLE001
+                # raised to the caller by the future, as ThreadPoolExecutor does
+                future.set_exception(e)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        if cancel_futures:
+            while True:
+                try:
+                    call = self.calls.get_nowait()
+                except queue.Empty:
+                    break
+                if call is not None:
+                    call[0].cancel()
+        self.calls.put(None)
+        if wait:
+            self.thread.join()
+
+
+class RigRunner:
+    """Runs shuffle -> scan -> solve -> execute cycles on one rig.
+
+    All blocking hardware calls run on the rig's own daemon thread, so a
+    rig that stalls only holds up itself, and is left behind when the
+    process exits. Solving is sent to the shared solver pool.
+    """
+
+    def __init__(
+        self,
+        rig: Rig,
+        solver_pool: Executor,
+        num_moves: int = 20,
+        cycle_timeout: float = 120.0,
+        max_recovery_attempts: int = 2,
+        max_consecutive_errors: int = 3,
+        rng: np.random.Generator = None,
+    ):
+        self.rig = rig
+        self.solver_pool = solver_pool
+        self.num_moves = num_moves
+        self.cycle_timeout = cycle_timeout
+        self.max_recovery_attempts = max_recovery_attempts
+        self.max_consecutive_errors = max_consecutive_errors
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.executor = RigThread(rig.name)
+        self.stats = SoakStats()
+        self.stalled = False
+
+    async def call(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def run_tracked_moves(self, moves: Moves):
+        with self.rig.tracker.track_moves(moves):
+            self.rig.arduino.run_moves(moves)
+
+    def run_tracked_schedule(self, moves: Moves, schedule: list[np.ndarray]):
+        with self.rig.tracker.track_moves(moves):
+            self.rig.arduino.run_schedule(schedule)
+
+    async def scan_and_solve(self) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_recovery_attempts + 1):
+            if attempt > 0:
+                self.stats.recoveries += 1
+                logging.warning(f"{self.rig.name}: rescan attempt {attempt}")
+            with Timed(self.stats, "scan"):
+                cube_state = await self.call(self.rig.tracker.scan, self.rig.perception)
+            self.stats.scans += 1
+            try:
+                with Timed(self.stats, "solve"):
+                    return await loop.run_in_executor(
+                        self.solver_pool, solve, cube_state
+                    )
+            except ValueError:
+                # the scan is not a valid cube state
+                self.stats.scan_failures += 1
+                # force a full scan next time
+                self.rig.tracker.invalidate()
+                logging.warning(f"{self.rig.name}: unable to solve {cube_state}")
+        raise RuntimeError("Unable to scan a solvable cube state")
+
+    async def run_cycle(self):
+        moves = generate_scrambles(1, self.num_moves, self.rng)[0]
+        with Timed(self.stats, "shuffle"):
+            await self.call(self.run_tracked_moves, moves)
+
+        self.stats.cycles += 1
+        solution = await self.scan_and_solve()
+
+        schedule = schedule_moves(solution)
+        self.stats.predicted_saved_time += get_schedule_report(schedule).saved_time
+        with Timed(self.stats, "execute"):
+            await self.call(self.run_tracked_schedule, solution, schedule)
+        self.stats.successes += 1
+
+    async def run(self, num_cycles: int):
+        try:
+            await asyncio.wait_for(
+                self.call(self.rig.arduino.wait_for_ready), self.cycle_timeout
+            )
+        except OSError:
+            # serial errors and timeouts, including the ready timeout
+            logging.exception(f"{self.rig.name}: not ready, skipping rig")
+            self.stats.errors += 1
+            return
+
+        consecutive_errors = 0
+        for cycle in range(num_cycles):
+            try:
+                await asyncio.wait_for(self.run_cycle(), self.cycle_timeout)
+                consecutive_errors = 0
+            except asyncio.TimeoutError:
+                # the rig's thread may never return, so give up on the rig
+                logging.error(f"{self.rig.name}: stalled, taking rig offline")
+                self.stats.stalls += 1
+                self.stalled = True
+                break
+            except Exception:  # noqa: BLE001
+                # the rig's error accounting: whatever fails a cycle only
+                # takes this rig offline, never the other rigs
+                logging.exception(f"{self.rig.name}: cycle {cycle + 1} failed")
+                self.stats.errors += 1
+                consecutive_errors += 1
+                if consecutive_errors >= self.max_consecutive_errors:
+                    logging.error(f"{self.rig.name}: too many errors, taking offline")
+                    break
+
+            self.stats.link_resyncs = getattr(self.rig.arduino, "num_resyncs", 0)
+            self.stats.update_perception_stats(self.rig.perception)
+            logging.info(
+                f"{self.rig.name}: cycle {cycle + 1}/{num_cycles}, "
+                f"{self.stats.successes} solved"
+            )
+
+        self.executor.shutdown(wait=not self.stalled, cancel_futures=True)
+
+
+class Orchestrator:
+    """Runs independent cycles on several rigs from one host"""
+
+    def __init__(
+        self,
+        rigs: list[Rig],
+        num_moves: int = 20,
+        solver_workers: int = 2,
+        cycle_timeout: float = 120.0,
+        random_seed: int = None,
+    ):
+        self.rigs = rigs
+        self.num_moves = num_moves
+        self.solver_workers = solver_workers
+        self.cycle_timeout = cycle_timeout
+        self.seeds = np.random.SeedSequence(random_seed).spawn(len(rigs))
+        self.runners: list[RigRunner] = []
+
+    def summary(self) -> dict:
+        rigs = {runner.rig.name: runner.stats.summary() for runner in self.runners}
+        return {
+            "cycles_per_hour": sum(rig["cycles_per_hour"] for rig in rigs.values()),
+            "stalled_rigs": [r.rig.name for r in self.runners if r.stalled],
+            "rigs": rigs,
+        }
+
+    async def check_warmups(self, warmups: list[asyncio.Future]):
+        """Log how each solver worker's warm-up went"""
+        for warmup in asyncio.as_completed(warmups):
+            try:
+                results = await warmup
+            except (BrokenExecutor, ImportError, OSError, ValueError):
+                # the worker crashed, or is missing the solver or its tables
+                logging.exception("Solver worker warm-up failed")
+                continue
+            logging.info(
+                f"Solver worker warm: cold {results['cold_ms']:.1f}ms, "
+                f"warm {results['warm_ms']:.1f}ms"
+            )
+
+    async def write_summaries(self, summary_path: Path, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            write_summary(self.summary(), summary_path)
+
+    async def run(
+        self,
+        num_cycles: int,
+        summary_path: Path = None,
+        summary_interval: float = 60.0,
+    ) -> dict:
+        writer = None
+        if summary_path is not None:
+            writer = asyncio.create_task(
+                self.write_summaries(summary_path, summary_interval)
+            )
+
+        with ProcessPoolExecutor(max_workers=self.solver_workers) as solver_pool:
+            # start every worker and load its tables while the rigs get ready
+            warmups = [
+                asyncio.wrap_future(solver_pool.submit(warm_up_solver))
+                for _ in range(self.solver_workers)
+            ]
+            self.runners = [
+                RigRunner(
+                    rig,
+                    solver_pool,
+                    num_moves=self.num_moves,
+                    cycle_timeout=self.cycle_timeout,
+                    rng=np.random.default_rng(seed),
+                )
+                for rig, seed in zip(self.rigs, self.seeds)
+            ]
+            await asyncio.gather(
+                self.check_warmups(warmups),
+                *(runner.run(num_cycles) for runner in self.runners),
+            )
+
+        summary = self.summary()
+        if writer is not None:
+            writer.cancel()
+            write_summary(summary, summary_path)
+        return summary
@@ -1,24 +1,32 @@
 import logging
-from typing import Iterable
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 import cv2
-import joblib
 import numpy as np
-from sklearn.base import ClassifierMixin
 
 from rubiks_cube_solver.arduino import Arduino
-from rubiks_cube_solver.calibration import load_calibration
+from rubiks_cube_solver.calibration import AutoCalibration
+from rubiks_cube_solver.camera import Camera, load_camera_configs
 from rubiks_cube_solver.constants import (
+    CALIBRATION_SIZE,
     CLASS_TO_COLOR,
     COLOR_NEIGHBORHOOD,
     COLOR_TO_FACE,
     DEBUG_PATH,
+    FACE_TO_POSITION,
+    MAX_FACE_RESCANS,
     MODEL_PATH,
     POSITION_TO_CAMERA_IDX,
     POSITION_TO_FACES,
     ROTATED_FACET_IDX_TO_COORDINATE_IDX,
 )
-from rubiks_cube_solver.cv import get_rgb, rgb_to_hsv
+from rubiks_cube_solver.cube import CODE_PERMUTATIONS, FACE_ORDER, NUM_FACELETS
+from rubiks_cube_solver.cv import rgb_to_hsv
+from rubiks_cube_solver.frames import FramePool
+from rubiks_cube_solver.move import get_move_code, to_move_string
+from rubiks_cube_solver.settle import read_settled_frame
 from rubiks_cube_solver.types import (
     Color,
     Coordinate,
@@ -27,6 +35,10 @@ from rubiks_cube_solver.types import (
     Position,
 )
 from rubiks_cube_solver.utils import timer
+from rubiks_cube_solver.validation import validate_cube_state
+
+if TYPE_CHECKING:
+    from sklearn.base import ClassifierMixin
 
 
 class Perception:
@@ -34,26 +46,113 @@ class Perception:
         self,
         arduino: Arduino,
         debug: bool = False,
+        auto_calibrate: bool = True,
+        cameras: dict[Position, Camera] = None,
+        auto_calibration: AutoCalibration = None,
+        undo_turns: bool = True,
+        settle: bool = False,
     ):
         self.arduino = arduino
         self.debug = debug
+        self.auto_calibrate = auto_calibrate
+        self.undo_turns = undo_turns
+        self.settle = settle
+        # Telemetry of settled captures
+        self.settle_times: list[float] = []
+        self.num_settle_timeouts = 0
+        self.num_face_rescans = 0
+        self.frame_pool = FramePool()
+        # Peak frame memory of each scan
+        self.peak_frame_bytes: list[int] = []
 
         if self.debug and not DEBUG_PATH.exists():
             DEBUG_PATH.mkdir(parents=True, exist_ok=True)
 
-        self.calibration = load_calibration()
-        self.color_detector: ClassifierMixin = joblib.load(MODEL_PATH)
+        self.auto_calibration = auto_calibration or AutoCalibration.load()
+        self.calibration = self.auto_calibration.calibration
+        # unpickling the model imports scikit-learn, only needed from here
+        import joblib
+
+        self.color_detector: "ClassifierMixin" = joblib.load(MODEL_PATH)
+
+        if cameras is None:
+            camera_configs = load_camera_configs()
+            cameras = {
+                position: Camera(
+                    POSITION_TO_CAMERA_IDX[position], camera_configs[position]
+                )
+                for position in Position
+            }
+        self.cameras = cameras
 
     @timer
-    def capture_image(self, position: Position):
+    def capture_image(self, position: Position, calibrate: bool = True) -> Image:
+        """Capture into buffers borrowed from the frame pool, the image is only
+        valid until it is released with `frame_pool.release`.
+
+        Captures with turned faces pass `calibrate=False`, as their stickers
+        no longer match the references of the drift check.
+        """
+        image = self.frame_pool.borrow()
+        try:
+            self.read_frame(position, image.rgb)
+            rgb_to_hsv(image.rgb, dst=image.hsv)
+            if self.auto_calibrate and calibrate:
+                self.auto_calibration.update(position, image)
+        except Exception:
+            self.frame_pool.release(image)
+            raise
+        return image
+
+    @contextmanager
+    def captured_image(
+        self,
+        position: Position,
+        images: dict[Position, Image] = None,
+        calibrate: bool = True,
+    ) -> Iterator[Image]:
+        """Use the image of a position if given, else capture one for the block"""
+        if images and position in images:
+            yield images[position]
+            return
+
+        image = self.capture_image(position, calibrate)
+        try:
+            yield image
+        finally:
+            self.frame_pool.release(image)
+
+    def read_frame(self, position: Position, rgb: np.ndarray):
+        # frames at another resolution are read into a buffer of their own,
+        # allocated by the first read
+        dst = self.frame_pool.capture_buffers.get(position, rgb)
         self.arduino.turn_light_on(position)
         try:
-            rgb = get_rgb(POSITION_TO_CAMERA_IDX[position])
-        except Exception as e:
-            raise e
+            if self.settle:
+                frame = self.read_settled(position, dst)
+            else:
+                frame = self.cameras[position].read(dst=dst)
         finally:
             self.arduino.turn_light_off(position)
-        return Image(rgb=rgb, hsv=rgb_to_hsv(rgb))
+
+        if frame.shape != rgb.shape:
+            self.frame_pool.capture_buffers[position] = frame
+            cv2.resize(frame, CALIBRATION_SIZE, dst=rgb)
+        elif frame is not rgb:
+            np.copyto(rgb, frame)
+
+    def read_settled(self, position: Position, dst: np.ndarray) -> np.ndarray:
+        """Read the first frame in which the visible facets are still"""
+        coordinates = [
+            coordinate
+            for face in POSITION_TO_FACES[position]
+            for coordinate in self.calibration.facet_coordinates[face]
+        ]
+        settled = read_settled_frame(self.cameras[position], coordinates, dst=dst)
+        self.settle_times.append(settled.settle_time)
+        if not settled.settled:
+            self.num_settle_timeouts += 1
+        return settled.frame
 
     def get_face_colors(self, position: Position, face: Face, image: Image):
         coordinates = self.calibration.facet_coordinates[face]
@@ -63,16 +162,16 @@ class Perception:
         if self.debug:
             self.log_face_colors(face, coordinates, colors, image)
 
-        self.arduino.run_move(f"{face.value}2")
-        image_rotated = self.capture_image(position)
-        self.arduino.run_move(f"{face.value}2'")
+        self.arduino.run_move(get_move_code(face.value, "2"))
+        with self.captured_image(position, calibrate=False) as image_rotated:
+            self.arduino.run_move(get_move_code(face.value, "2'"))
 
-        colors_rotated = self.get_image_colors(image_rotated, coordinates)
+            colors_rotated = self.get_image_colors(image_rotated, coordinates)
 
-        if self.debug:
-            self.log_face_colors(
-                face, coordinates, colors_rotated, image_rotated, suffix="_rotated"
-            )
+            if self.debug:
+                self.log_face_colors(
+                    face, coordinates, colors_rotated, image_rotated, suffix="_rotated"
+                )
 
         for facet_idx, coordinate_idx in ROTATED_FACET_IDX_TO_COORDINATE_IDX[
             face
@@ -104,7 +203,8 @@ class Perception:
         img: Image,
         suffix: str = "",
     ):
-        annotated = img.rgb.copy()
+        annotated = self.frame_pool.scratch
+        np.copyto(annotated, img.rgb)
         for coordinate, color in zip(coordinates, colors, strict=False):
             start = (
                 coordinate.x - COLOR_NEIGHBORHOOD,
@@ -128,18 +228,123 @@ class Perception:
 
         cv2.imwrite(DEBUG_PATH / f"debug_face_{face.value}{suffix}.jpg", annotated)
 
-    def get_cube_colors(self):
+    def get_cube_colors(self, images: dict[Position, Image] = None):
         cube_colors: dict[Face, Iterable[Color]] = {}
         for position in [Position.LOWER, Position.UPPER]:
-            image = self.capture_image(position)
-            for face in POSITION_TO_FACES[position]:
-                cube_colors[face] = self.get_face_colors(position, face, image)
-                logging.debug(f"{face=}, {cube_colors[face]=}")
+            with self.captured_image(position, images) as image:
+                for face in POSITION_TO_FACES[position]:
+                    cube_colors[face] = self.get_face_colors(position, face, image)
+                    logging.debug(f"{face=}, {cube_colors[face]=}")
 
         return cube_colors
 
-    def get_cube_state(self):
-        cube_colors = self.get_cube_colors()
+    def get_visible_facelets(
+        self, position: Position, image: Image, suffix: str = ""
+    ) -> list[tuple[int, Color]]:
+        """Read the facelets visible from a position, by index in the state"""
+        facelets = []
+        for face in POSITION_TO_FACES[position]:
+            coordinates = self.calibration.facet_coordinates[face]
+            colors = self.get_image_colors(image, coordinates)
+            if self.debug:
+                self.log_face_colors(face, coordinates, colors, image, suffix)
+
+            offset = FACE_ORDER.index(face.value) * 9
+            for facet_idx, color in enumerate(colors):
+                if facet_idx in ROTATED_FACET_IDX_TO_COORDINATE_IDX[face]:
+                    continue
+                # skip over the center facelet, which is not calibrated
+                facelets.append((offset + facet_idx + (facet_idx >= 4), color))
+        return facelets
+
+    def check_cube_state(self, cube_state: str, images: dict[Position, Image]) -> bool:
+        """Compare the facelets visible without rotating against a cube state"""
+        num_mismatches = 0
+        for position, image in images.items():
+            for state_idx, color in self.get_visible_facelets(position, image):
+                if COLOR_TO_FACE[color].value != cube_state[state_idx]:
+                    num_mismatches += 1
+
+        if num_mismatches:
+            logging.info(f"{num_mismatches} visible facelets disagree with state")
+        return num_mismatches == 0
+
+    def get_turned_cube_state(self, images: dict[Position, Image] = None) -> str:
+        """Scan without undoing the face turns, returning the state they leave.
+
+        Every capture reads the visible facelets and traces them back through
+        the turns made so far to the state before the scan, which is then
+        turned like the physical cube.
+        """
+        permutation = np.arange(NUM_FACELETS)
+        readings: dict[int, list[Color]] = defaultdict(list)
+        for i, position in enumerate([Position.LOWER, Position.UPPER]):
+            # only the first position's given image was captured before any
+            # turn, the other is captured again after the turns
+            reused = images if i == 0 else None
+            with self.captured_image(position, reused) as image:
+                for state_idx, color in self.get_visible_facelets(position, image):
+                    readings[permutation[state_idx]].append(color)
+
+            for face in POSITION_TO_FACES[position]:
+                move = get_move_code(face.value, "2")
+                self.arduino.run_move(move)
+                permutation = permutation[CODE_PERMUTATIONS[move]]
+                with self.captured_image(position, calibrate=False) as image:
+                    for state_idx, color in self.get_visible_facelets(
+                        position, image, suffix=f"_{to_move_string(move)}"
+                    ):
+                        readings[permutation[state_idx]].append(color)
+
+        cube_state = [face for face in FACE_ORDER for _ in range(9)]
+        for state_idx in range(NUM_FACELETS):
+            if state_idx % 9 == 4:
+                continue
+            if not readings[state_idx]:
+                raise ValueError(f"Facelet {state_idx} was never visible")
+            colors = Counter(readings[state_idx])
+            if len(colors) > 1:
+                logging.debug(f"Conflicting reads of facelet {state_idx}: {colors}")
+            cube_state[state_idx] = COLOR_TO_FACE[colors.most_common(1)[0][0]].value
+
+        return "".join(np.array(cube_state)[permutation])
+
+    def get_cube_state(self, expected: str = None):
+        """Scan the cube state.
+
+        With an expected state, e.g. from tracking executed moves, a single
+        capture per camera confirms it and the full scan only runs if the
+        visible facelets disagree. Without `undo_turns`, the scan leaves the
+        faces turned and returns the state the cube is left in.
+        """
+        self.frame_pool.reset_peak()
+        images: dict[Position, Image] = {}
+        try:
+            return self.scan_cube_state(expected, images)
+        finally:
+            for image in images.values():
+                self.frame_pool.release(image)
+            if self.auto_calibrate:
+                self.auto_calibration.save_changes()
+            self.peak_frame_bytes.append(self.frame_pool.peak_bytes)
+            logging.debug(
+                f"Peak frame memory {self.frame_pool.peak_bytes / 2**20:.1f}MB, "
+                f"{self.frame_pool.peak_borrowed} images"
+            )
+
+    def scan_cube_state(self, expected: str, images: dict[Position, Image]) -> str:
+        """Scan for `get_cube_state`, adding the images it keeps to `images`"""
+        if expected is not None:
+            for position in [Position.LOWER, Position.UPPER]:
+                images[position] = self.capture_image(position)
+            if self.check_cube_state(expected, images):
+                logging.info("Confirmed expected cube state, skipping full scan")
+                return expected
+
+        if not self.undo_turns:
+            return self.repair_cube_state(self.get_turned_cube_state(images))
+
+        cube_colors = self.get_cube_colors(images)
         cube_state: Iterable[Face] = []
         # need to return order expected by solver:
         # U1, U2, U3, U4, U5, U6, U7, U8, U9,
@@ -155,4 +360,39 @@ class Perception:
                     # add center facelet
                     cube_state.append(face)
 
-        return "".join([state.value for state in cube_state])
+        return self.repair_cube_state("".join([state.value for state in cube_state]))
+
+    def rescan_faces(self, cube_state: str, faces: Iterable[Face]) -> str:
+        """Recapture single faces and patch their colors into a cube state"""
+        facelets = list(cube_state)
+        for face in faces:
+            position = FACE_TO_POSITION[face]
+            with self.captured_image(position) as image:
+                colors = self.get_face_colors(position, face, image)
+            offset = FACE_ORDER.index(face.value) * 9
+            for facet_idx, color in enumerate(colors):
+                facelets[offset + facet_idx + (facet_idx >= 4)] = COLOR_TO_FACE[
+                    color
+                ].value
+        return "".join(facelets)
+
+    def repair_cube_state(self, cube_state: str) -> str:
+        """Rescan the faces most likely misread while the state is invalid"""
+        rescanned: set[Face] = set()
+        validation = validate_cube_state(cube_state)
+        while not validation.valid and len(rescanned) < MAX_FACE_RESCANS:
+            faces = [f for f in validation.get_suspect_faces() if f not in rescanned]
+            if not faces:
+                break
+            logging.info(
+                f"Invalid cube state ({'; '.join(validation.errors)}), "
+                f"rescanning {faces[0].name} face"
+            )
+            cube_state = self.rescan_faces(cube_state, faces[:1])
+            rescanned.add(faces[0])
+            self.num_face_rescans += 1
+            validation = validate_cube_state(cube_state)
+
+        if not validation.valid:
+            logging.warning(f"Unable to repair cube state: {cube_state}")
+        return cube_state
@@ -0,0 +1,163 @@
+import cProfile
+import functools
+import logging
+import os
+import pstats
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+from rubiks_cube_solver.constants import DEBUG_PATH, ROOT_PATH
+
+PROFILE_DIR = DEBUG_PATH / "profiles"
+PROFILE_MODES = ["cprofile", "sample"]
+SAMPLE_INTERVAL = 0.005
+
+
+def get_git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def get_profile_path(name: str, suffix: str) -> Path:
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    host = socket.gethostname()
+    return PROFILE_DIR / f"{name}_{timestamp}_{get_git_revision()}_{host}{suffix}"
+
+
+class SamplingProfiler:
+    """Samples the stack of a thread and counts collapsed stacks.
+
+    The output is in the collapsed format used by flamegraph tools:
+    one `frame;frame;frame count` line per distinct stack.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+
+    def _sample(self, thread_id: int):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                filename = os.path.basename(code.co_filename)
+                frames.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def __enter__(self):
+        self._thread = threading.Thread(
+            target=self._sample, args=(threading.get_ident(),), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def dump(self, path: Path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def pop_profile_mode() -> str | None:
+    """Remove `--profile[=mode]` from argv, falling back to the PROFILE env var"""
+    mode = os.environ.get("PROFILE") or None
+    for arg in list(sys.argv[1:]):
+        if arg == "--profile":
+            mode = PROFILE_MODES[0]
+            sys.argv.remove(arg)
+        elif arg.startswith("--profile="):
+            mode = arg.removeprefix("--profile=")
+            sys.argv.remove(arg)
+
+    if mode is not None and mode.lower() in ("", "0", "false"):
+        mode = None
+    elif mode is not None and mode.lower() in ("1", "true"):
+        mode = PROFILE_MODES[0]
+    if mode is not None and mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode}, expected {PROFILE_MODES}")
+    return mode
+
+
+def profile_main(main: Callable):
+    """Run a CLI entry point under a profiler when requested.
+
+    Pass `--profile` (cProfile, saves .pstats) or `--profile=sample`
+    (sampling, saves .collapsed), or set the PROFILE environment variable
+    ("0" or "false" disable it).
+    """
+
+    @functools.wraps(main)
+    def wrapped(*args, **kwargs):
+        mode = pop_profile_mode()
+        if mode is None:
+            return main(*args, **kwargs)
+
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        name = Path(sys.argv[0]).stem
+
+        if mode == "sample":
+            profiler = SamplingProfiler()
+            try:
+                with profiler:
+                    return main(*args, **kwargs)
+            finally:
+                path = get_profile_path(name, ".collapsed")
+                profiler.dump(path)
+                logging.info(f"Saved profile to {path}")
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(main, *args, **kwargs)
+        finally:
+            path = get_profile_path(name, ".pstats")
+            profiler.dump_stats(path)
+            logging.info(f"Saved profile to {path}")
+
+    return wrapped
+
+
+def load_profile(path: Path) -> dict[str, float]:
+    """Load own time (seconds, or samples for collapsed stacks) per function"""
+    totals: Counter[str] = Counter()
+    if path.suffix == ".collapsed":
+        with open(path) as f:
+            for line in f:
+                stack, count = line.rstrip("\n").rsplit(" ", 1)
+                totals[stack.split(";")[-1]] += int(count)
+        return dict(totals)
+
+    stats = pstats.Stats(str(path))
+    for (filename, lineno, name), (_, _, tottime, _, _) in stats.stats.items():
+        totals[f"{name} ({os.path.basename(filename)}:{lineno})"] += tottime
+    return dict(totals)
+
+
+def diff_profiles(
+    before: dict[str, float], after: dict[str, float]
+) -> list[tuple[str, float, float]]:
+    """Return (function, before, after) sorted by largest absolute change"""
+    functions = set(before) | set(after)
+    rows = [(f, before.get(f, 0.0), after.get(f, 0.0)) for f in functions]
+    return sorted(rows, key=lambda row: abs(row[2] - row[1]), reverse=True)
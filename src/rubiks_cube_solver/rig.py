@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+from rubiks_cube_solver.constants import (
+    CAMERAS_PATH,
+    CUBE_STATE_PATH,
+    DEFAULT_RIG_CONFIG,
+    FACES_PATH,
+    HOMOGRAPHIES_PATH,
+    RIGS_PATH,
+    ROOT_PATH,
+)
+from rubiks_cube_solver.tracking import CubeStateTracker
+from rubiks_cube_solver.types import Position, RigConfig
+
+
+def load_rig_configs(path: Path = RIGS_PATH) -> dict[str, RigConfig]:
+    """Load the rigs attached to this host, or the default single rig.
+
+    Each entry maps a rig name to its serial port, camera indices by position
+    code, and a data directory relative to the repo root, e.g.
+    {"rig1": {"arduino_path": "/dev/ttyACM0", "camera_indices": {"U": 0, "L": 2},
+    "data_path": "data/rig1"}}
+    """
+    if not path.exists():
+        return {DEFAULT_RIG_CONFIG.name: DEFAULT_RIG_CONFIG}
+
+    with open(path) as f:
+        data: dict[str, dict] = json.load(f)
+
+    return {
+        name: RigConfig(
+            name=name,
+            arduino_path=config["arduino_path"],
+            camera_indices={
+                Position(position_id): idx
+                for position_id, idx in config["camera_indices"].items()
+            },
+            data_path=ROOT_PATH / config["data_path"],
+        )
+        for name, config in data.items()
+    }
+
+
+class Rig:
+    """One robot: its Arduino link, perception and tracked cube state"""
+
+    def __init__(self, name: str, arduino, perception, tracker: CubeStateTracker):
+        self.name = name
+        self.arduino = arduino
+        self.perception = perception
+        self.tracker = tracker
+
+    @classmethod
+    def from_config(cls, config: RigConfig, debug: bool = False) -> "Rig":
+        from rubiks_cube_solver.arduino import Arduino
+        from rubiks_cube_solver.calibration import AutoCalibration
+        from rubiks_cube_solver.camera import Camera, load_camera_configs
+        from rubiks_cube_solver.perception import Perception
+
+        arduino = Arduino(port=config.arduino_path)
+        camera_configs = load_camera_configs(config.data_path / CAMERAS_PATH.name)
+        cameras = {
+            position: Camera(config.camera_indices[position], camera_configs[position])
+            for position in Position
+        }
+        auto_calibration = AutoCalibration.load(
+            cache_path=config.data_path / HOMOGRAPHIES_PATH.name,
+            faces_path=config.data_path / FACES_PATH.name,
+        )
+        perception = Perception(
+            arduino, debug=debug, cameras=cameras, auto_calibration=auto_calibration
+        )
+        tracker = CubeStateTracker(config.data_path / CUBE_STATE_PATH.name)
+        return cls(config.name, arduino, perception, tracker)
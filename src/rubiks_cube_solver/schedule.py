@@ -0,0 +1,88 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from rubiks_cube_solver.constants import (
+    COMMAND_OVERHEAD,
+    MOTOR_ACCELERATION,
+    MOTOR_MAX_SPEED,
+    MOTOR_STEPS_PER_TURN,
+)
+from rubiks_cube_solver.move import (
+    MOVE_FACES,
+    Moves,
+    as_moves,
+    get_move_amounts,
+    get_move_faces,
+)
+
+
+@dataclass
+class ScheduleReport:
+    num_moves: int
+    num_steps: int
+    serial_time: float
+    parallel_time: float
+
+    @property
+    def saved_time(self) -> float:
+        return self.serial_time - self.parallel_time
+
+
+def predict_turn_time(num_turns: int) -> float:
+    """Seconds of motor time for a move with a trapezoidal velocity profile"""
+    steps = MOTOR_STEPS_PER_TURN * num_turns
+    ramp_steps = MOTOR_MAX_SPEED**2 / MOTOR_ACCELERATION
+    if steps < ramp_steps:
+        return 2 * math.sqrt(steps / MOTOR_ACCELERATION)
+    ramp_time = 2 * MOTOR_MAX_SPEED / MOTOR_ACCELERATION
+    return ramp_time + (steps - ramp_steps) / MOTOR_MAX_SPEED
+
+
+# Motor time of quarter and half turns
+TURN_TIMES = np.array([predict_turn_time(1), predict_turn_time(2)])
+
+
+def predict_move_times(moves: Moves) -> np.ndarray:
+    return TURN_TIMES[get_move_amounts(as_moves(moves)) - 1]
+
+
+def predict_step_time(step: Moves) -> float:
+    return COMMAND_OVERHEAD + float(predict_move_times(step).max())
+
+
+def schedule_moves(moves: Moves) -> list[np.ndarray]:
+    """Group consecutive opposite-face moves into steps run in parallel.
+
+    Opposite faces turn about the same axis with independent motors, so
+    such moves commute and can run at the same time.
+    """
+    codes = as_moves(moves)
+    if len(codes) == 0:
+        return []
+
+    faces = get_move_faces(codes)
+    opposite = len(MOVE_FACES) // 2
+    # a move joins the previous step if it turns the opposite face of a
+    # single-move step
+    starts = []
+    for i in range(len(codes)):
+        joins = (
+            i > 0
+            and starts[-1] == i - 1
+            and faces[i] == (faces[i - 1] + opposite) % len(MOVE_FACES)
+        )
+        if not joins:
+            starts.append(i)
+    return np.split(codes, starts[1:])
+
+
+def get_schedule_report(schedule: list[np.ndarray]) -> ScheduleReport:
+    moves = np.concatenate(schedule) if schedule else np.array([], dtype=np.uint8)
+    return ScheduleReport(
+        num_moves=len(moves),
+        num_steps=len(schedule),
+        serial_time=float((COMMAND_OVERHEAD + predict_move_times(moves)).sum()),
+        parallel_time=sum(predict_step_time(step) for step in schedule),
+    )
@@ -0,0 +1,55 @@
+import argparse
+import logging
+from pathlib import Path
+
+import cv2
+
+from rubiks_cube_solver.calibration import AutoCalibration, get_edges
+from rubiks_cube_solver.constants import COLOR_NEIGHBORHOOD, POSITION_TO_FACES
+from rubiks_cube_solver.cv import keep_windows_open, show_image
+from rubiks_cube_solver.types import Image, Position
+from rubiks_cube_solver.utils import maybe_commit
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-i",
+        "--input",
+        required=True,
+        type=str,
+        help="Path to input images",
+    )
+    args = parser.parse_args()
+
+    input_dir = Path(args.input)
+    if not input_dir.exists():
+        raise RuntimeError("Invalid input directory")
+
+    auto_calibration = AutoCalibration.load()
+
+    for pos in Position:
+        rgb = cv2.imread(input_dir / f"{pos}_rgb.jpg")
+        img = Image(rgb=rgb, hsv=cv2.imread(input_dir / f"{pos}_hsv.jpg"))
+        edges = get_edges(img)
+
+        annotated = img.rgb.copy()
+        for face in POSITION_TO_FACES[pos]:
+            if not auto_calibration.register(face, img, edges):
+                logging.warning(f"Unable to register face: {face}")
+                continue
+
+            for coord in auto_calibration.calibration.facet_coordinates[face]:
+                start = (coord.x - COLOR_NEIGHBORHOOD, coord.y - COLOR_NEIGHBORHOOD)
+                end = (coord.x + COLOR_NEIGHBORHOOD, coord.y + COLOR_NEIGHBORHOOD)
+                annotated = cv2.rectangle(annotated, start, end, (0, 0, 0), -1)
+
+        show_image(f"Registered: {pos}", annotated)
+
+    keep_windows_open(destroy=True)
+
+    maybe_commit(auto_calibration.save)
+
+
+if __name__ == "__main__":
+    main()
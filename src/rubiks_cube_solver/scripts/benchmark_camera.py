@@ -0,0 +1,245 @@
+import argparse
+import logging
+import time
+from dataclasses import replace
+
+import cv2
+import joblib
+import numpy as np
+from sklearn.base import ClassifierMixin
+
+from rubiks_cube_solver.arduino import Arduino
+from rubiks_cube_solver.calibration import AutoCalibration
+from rubiks_cube_solver.camera import (
+    configure_capture,
+    get_capture_mode,
+    load_camera_configs,
+    save_camera_config,
+)
+from rubiks_cube_solver.constants import (
+    CALIBRATION_SIZE,
+    CAMERAS_PATH,
+    CLASS_TO_COLOR,
+    COLOR_NEIGHBORHOOD,
+    COLOR_TO_FACE,
+    DEFAULT_RIG_CONFIG,
+    FACES_PATH,
+    HOMOGRAPHIES_PATH,
+    MODEL_PATH,
+    POSITION_TO_FACES,
+    ROTATED_FACET_IDX_TO_COORDINATE_IDX,
+)
+from rubiks_cube_solver.cube import FACE_ORDER, SOLVED_STATE
+from rubiks_cube_solver.cv import rgb_to_hsv
+from rubiks_cube_solver.rig import load_rig_configs
+from rubiks_cube_solver.types import (
+    Calibration,
+    CameraConfig,
+    Color,
+    Coordinate,
+    Position,
+)
+from rubiks_cube_solver.utils import maybe_commit
+
+CANDIDATE_MODES = [
+    (320, 240, "MJPG"),
+    (320, 240, "YUYV"),
+    (640, 480, "MJPG"),
+    (640, 480, "YUYV"),
+    (1280, 720, "MJPG"),
+    (1280, 720, "YUYV"),
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Camera capture mode benchmark")
+    parser.add_argument(
+        "-p",
+        "--position",
+        required=True,
+        type=str,
+        help="Camera position code (e.g. U)",
+    )
+    parser.add_argument(
+        "--rig",
+        required=False,
+        type=str,
+        default=DEFAULT_RIG_CONFIG.name,
+        help="Name of the configured rig whose camera to benchmark",
+    )
+    parser.add_argument(
+        "--num-frames",
+        required=False,
+        type=int,
+        default=30,
+        help="How many frames to time per mode",
+    )
+    parser.add_argument(
+        "--warmup-frames",
+        required=False,
+        type=int,
+        default=5,
+        help="How many frames to discard after switching modes",
+    )
+    parser.add_argument(
+        "--cube-state",
+        required=False,
+        type=str,
+        default=SOLVED_STATE,
+        help="Known state of the cube in the rig, solved by default",
+    )
+    return parser.parse_args()
+
+
+def get_visible_facets(
+    position: Position, calibration: Calibration
+) -> list[tuple[int, Coordinate]]:
+    """Calibrated facets visible without turning a face, by index in the state"""
+    facets = []
+    for face in POSITION_TO_FACES[position]:
+        offset = FACE_ORDER.index(face.value) * 9
+        for facet_idx, coordinate in enumerate(calibration.facet_coordinates[face]):
+            if facet_idx in ROTATED_FACET_IDX_TO_COORDINATE_IDX[face]:
+                continue
+            # skip over the center facelet, which is not calibrated
+            facets.append((offset + facet_idx + (facet_idx >= 4), coordinate))
+    return facets
+
+
+def classify_facets(
+    frame: np.ndarray,
+    facets: list[tuple[int, Coordinate]],
+    color_detector: ClassifierMixin,
+) -> list[Color]:
+    """Classify facets of a frame resized to the calibration size"""
+    hsv = rgb_to_hsv(cv2.resize(frame, CALIBRATION_SIZE))
+
+    pixels = []
+    for _, coordinate in facets:
+        y, x = coordinate.y, coordinate.x
+        patch = hsv[
+            y - COLOR_NEIGHBORHOOD : y + COLOR_NEIGHBORHOOD,
+            x - COLOR_NEIGHBORHOOD : x + COLOR_NEIGHBORHOOD,
+        ]
+        pixels.append(patch.mean(axis=(0, 1)))
+    return [CLASS_TO_COLOR[c] for c in color_detector.predict(np.array(pixels))]
+
+
+def benchmark_mode(
+    arduino: Arduino,
+    position: Position,
+    idx: int,
+    config: CameraConfig,
+    num_frames: int,
+    warmup_frames: int,
+) -> tuple[dict, np.ndarray]:
+    start = time.perf_counter()
+    cap = cv2.VideoCapture(idx, cv2.CAP_V4L2)
+    if not cap.isOpened():
+        raise OSError(f"Unable to open webcam: {idx}")
+    try:
+        configure_capture(cap, config)
+        open_time = time.perf_counter() - start
+
+        # captures are lit like in Perception.read_frame, the warmup frames
+        # let the exposure adjust to the light
+        arduino.turn_light_on(position)
+        try:
+            for _ in range(warmup_frames):
+                cap.read()
+
+            latencies = []
+            for _ in range(num_frames):
+                start = time.perf_counter()
+                ret, frame = cap.read()
+                if not ret:
+                    raise OSError("Unable to read frame")
+                rgb_to_hsv(frame)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            arduino.turn_light_off(position)
+
+        result = {
+            **get_capture_mode(cap),
+            "open_ms": 1000 * open_time,
+            "mean_ms": 1000 * np.mean(latencies),
+            "p95_ms": 1000 * np.percentile(latencies, 95),
+            "frame_rate": len(latencies) / sum(latencies),
+        }
+        return result, frame
+    finally:
+        cap.release()
+
+
+def main():
+    args = parse_args()
+    position = Position(args.position)
+    # the rig's own camera settings and calibration, not the shared defaults
+    rig_config = load_rig_configs()[args.rig]
+    cameras_path = rig_config.data_path / CAMERAS_PATH.name
+    base_config = load_camera_configs(cameras_path)[position]
+    color_detector: ClassifierMixin = joblib.load(MODEL_PATH)
+    calibration = AutoCalibration.load(
+        cache_path=rig_config.data_path / HOMOGRAPHIES_PATH.name,
+        faces_path=rig_config.data_path / FACES_PATH.name,
+    ).calibration
+    arduino = Arduino(port=rig_config.arduino_path)
+    arduino.wait_for_ready()
+
+    # every mode is scored against the colors of the known cube state
+    facets = get_visible_facets(position, calibration)
+    expected_faces = [args.cube_state[state_idx] for state_idx, _ in facets]
+
+    results = []
+    for width, height, fourcc in CANDIDATE_MODES:
+        config = replace(base_config, width=width, height=height, fourcc=fourcc)
+        try:
+            result, frame = benchmark_mode(
+                arduino,
+                position,
+                rig_config.camera_indices[position],
+                config,
+                args.num_frames,
+                args.warmup_frames,
+            )
+        except OSError as e:
+            logging.warning(f"Skipping {width}x{height} {fourcc}: {e}")
+            continue
+
+        colors = classify_facets(frame, facets, color_detector)
+        agreement = np.mean(
+            [
+                COLOR_TO_FACE[color].value == face
+                for color, face in zip(colors, expected_faces, strict=True)
+            ]
+        )
+        results.append((config, result, agreement))
+
+    print(
+        f"{'requested':>18} {'actual':>18} {'open_ms':>8} {'mean_ms':>8} "
+        f"{'p95_ms':>8} {'fps':>6} {'agree':>6}"
+    )
+    best = None
+    for config, result, agreement in results:
+        requested = f"{config.width}x{config.height} {config.fourcc}"
+        actual = f"{result['width']}x{result['height']} {result['fourcc']}"
+        print(
+            f"{requested:>18} {actual:>18} {result['open_ms']:8.1f} "
+            f"{result['mean_ms']:8.1f} {result['p95_ms']:8.1f} "
+            f"{result['frame_rate']:6.1f} {agreement:6.2f}"
+        )
+        if agreement == 1.0 and (
+            best is None or result["mean_ms"] < best[1]["mean_ms"]
+        ):
+            best = (config, result)
+
+    if best is None:
+        logging.warning("No mode classified the known cube state correctly")
+        return
+
+    logging.info(f"Fastest correct mode: {best[0]}")
+    maybe_commit(lambda: save_camera_config(position, best[0], cameras_path))
+
+
+if __name__ == "__main__":
+    main()
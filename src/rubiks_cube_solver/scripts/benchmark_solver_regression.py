@@ -0,0 +1,114 @@
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from rubiks_cube_solver.constants import SOLVER_BASELINE_PATH, SOLVERS
+from rubiks_cube_solver.profiling import profile_main
+from rubiks_cube_solver.solver_benchmark import (
+    compare_to_baseline,
+    load_baseline,
+    run_solver_benchmark,
+    save_baseline,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Solver latency and solution length regression")
+    parser.add_argument(
+        "--num-scrambles",
+        required=False,
+        type=int,
+        default=200,
+        help="How many scrambles to solve",
+    )
+    parser.add_argument(
+        "--num-moves",
+        required=False,
+        type=int,
+        default=20,
+        help="Moves per scramble",
+    )
+    parser.add_argument(
+        "--random-seed",
+        required=False,
+        type=int,
+        default=0,
+        help="Random seed of the scramble corpus",
+    )
+    parser.add_argument(
+        "--solver",
+        required=False,
+        type=str,
+        choices=SOLVERS,
+        default="kociemba",
+        help="Which solver to benchmark",
+    )
+    parser.add_argument(
+        "--baseline",
+        required=False,
+        type=str,
+        default=str(SOLVER_BASELINE_PATH),
+        help="Baseline results to compare against",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to save the results as the new baseline",
+    )
+    parser.add_argument(
+        "--max-latency-ratio",
+        required=False,
+        type=float,
+        default=1.25,
+        help="Fail when p50 or p95 latency exceeds this multiple of the baseline",
+    )
+    parser.add_argument(
+        "--max-length-increase",
+        required=False,
+        type=float,
+        default=0.25,
+        help="Fail when the mean solution length grows by more than this",
+    )
+    args = parser.parse_args()
+    logging.info(f"Parsed args: {args}")
+    return args
+
+
+@profile_main
+def main():
+    args = parse_args()
+    baseline_path = Path(args.baseline)
+
+    results = run_solver_benchmark(
+        args.num_scrambles, args.num_moves, args.random_seed, args.solver
+    )
+    print(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        save_baseline(results, baseline_path)
+        logging.info(f"Saved baseline to {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        logging.error(f"No baseline at {baseline_path}, run with --update-baseline")
+        sys.exit(2)
+
+    failures = compare_to_baseline(
+        results,
+        load_baseline(baseline_path),
+        max_latency_ratio=args.max_latency_ratio,
+        max_length_increase=args.max_length_increase,
+    )
+    for failure in failures:
+        logging.error(f"Regression: {failure}")
+    if failures:
+        sys.exit(1)
+    logging.info("No regression against baseline")
+
+
+if __name__ == "__main__":
+    main()
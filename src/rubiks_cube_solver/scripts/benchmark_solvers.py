@@ -0,0 +1,137 @@
+import argparse
+import logging
+import sys
+import time
+from functools import partial
+from typing import Callable
+
+import numpy as np
+
+from rubiks_cube_solver.constants import OPTIMAL_MAX_NODES, OPTIMAL_TIME_LIMIT
+from rubiks_cube_solver.cube import SOLVED_STATE, apply_moves, is_solved
+from rubiks_cube_solver.move import generate_scrambles, get_rng
+from rubiks_cube_solver.optimal import (
+    SearchBudgetExceeded,
+    get_pattern_databases,
+    solve_optimal,
+)
+from rubiks_cube_solver.profiling import profile_main
+from rubiks_cube_solver.solver import solve
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Kociemba vs optimal solver benchmark")
+    parser.add_argument(
+        "--num-scrambles",
+        required=False,
+        type=int,
+        default=20,
+        help="How many scrambles to solve per scramble length",
+    )
+    parser.add_argument(
+        "--num-moves",
+        required=False,
+        type=int,
+        nargs="+",
+        default=[4, 6, 8, 10],
+        help="Scramble lengths to benchmark, the optimal solver is only meant to "
+        "finish short ones",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        required=False,
+        type=int,
+        default=OPTIMAL_MAX_NODES,
+        help="Optimal solver node budget before giving up on a scramble",
+    )
+    parser.add_argument(
+        "--time-limit",
+        required=False,
+        type=float,
+        default=OPTIMAL_TIME_LIMIT,
+        help="Optimal solver time budget before giving up on a scramble",
+    )
+    parser.add_argument(
+        "--random-seed",
+        required=False,
+        type=int,
+        default=0,
+        help="Random seed",
+    )
+    args = parser.parse_args()
+    logging.info(f"Parsed args: {args}")
+    return args
+
+
+def benchmark_solver(
+    cube_states: list[str], solve_func: Callable[[str], np.ndarray]
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Lengths and latencies of the solves that finish, and how many ran out
+    of search budget (and would fall back to kociemba in `solve`)"""
+    lengths, latencies, num_fallbacks = [], [], 0
+    for cube_state in cube_states:
+        start = time.perf_counter()
+        try:
+            solution = solve_func(cube_state)
+        except SearchBudgetExceeded:
+            num_fallbacks += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+        if not is_solved(apply_moves(cube_state, solution)):
+            raise RuntimeError(f"Invalid solution {solution} for {cube_state}")
+        lengths.append(len(solution))
+    return np.array(lengths), np.array(latencies), num_fallbacks
+
+
+@profile_main
+def main():
+    args = parse_args()
+    rng = get_rng(args.random_seed)
+    # load the memory-mapped databases before timing anything
+    get_pattern_databases()
+
+    num_fallbacks = 0
+    print(
+        f"{'moves':>5} {'solver':>8} {'solved':>6} {'fallbacks':>9} {'mean_len':>8} "
+        f"{'max_len':>7} {'mean_ms':>9} {'p95_ms':>9} {'max_ms':>9}"
+    )
+    for num_moves in args.num_moves:
+        cube_states = [
+            apply_moves(SOLVED_STATE, scramble)
+            for scramble in generate_scrambles(args.num_scrambles, num_moves, rng)
+        ]
+        results = {
+            "kociemba": benchmark_solver(cube_states, solve),
+            # no fallback, so the optimal row only counts optimal solutions
+            "optimal": benchmark_solver(
+                cube_states,
+                partial(
+                    solve_optimal,
+                    max_nodes=args.max_nodes,
+                    time_limit=args.time_limit,
+                ),
+            ),
+        }
+        num_fallbacks += results["optimal"][2]
+        for solver, (lengths, latencies, fallbacks) in results.items():
+            row = f"{num_moves:5d} {solver:>8} {len(lengths):6d} {fallbacks:9d}"
+            if len(lengths) == 0:
+                print(f"{row} {'-':>8} {'-':>7} {'-':>9} {'-':>9} {'-':>9}")
+                continue
+            print(
+                f"{row} {lengths.mean():8.2f} {lengths.max():7d} "
+                f"{1000 * latencies.mean():9.1f} "
+                f"{1000 * np.percentile(latencies, 95):9.1f} "
+                f"{1000 * latencies.max():9.1f}"
+            )
+
+    if num_fallbacks:
+        logging.error(
+            f"Optimal search ran out of budget on {num_fallbacks} scrambles, "
+            "which would fall back to kociemba"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
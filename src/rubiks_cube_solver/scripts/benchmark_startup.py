@@ -0,0 +1,64 @@
+import argparse
+import json
+import logging
+import sys
+
+from rubiks_cube_solver.constants import STARTUP_BUDGETS_MS
+from rubiks_cube_solver.profiling import profile_main
+from rubiks_cube_solver.startup_benchmark import (
+    compare_to_budgets,
+    get_entry_points,
+    run_startup_benchmark,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Console script import time budgets")
+    parser.add_argument(
+        "--num-runs",
+        required=False,
+        type=int,
+        default=5,
+        help="How many times to import each script, the fastest counts",
+    )
+    parser.add_argument(
+        "--scripts",
+        required=False,
+        type=str,
+        nargs="+",
+        default=None,
+        help="Which console scripts to measure, all by default",
+    )
+    parser.add_argument(
+        "--scale",
+        required=False,
+        type=float,
+        default=1.0,
+        help="Multiplier of the budgets, for hosts slower than a dev machine",
+    )
+    args = parser.parse_args()
+    logging.info(f"Parsed args: {args}")
+    return args
+
+
+@profile_main
+def main():
+    args = parse_args()
+
+    entry_points = get_entry_points()
+    if args.scripts is not None:
+        entry_points = {name: entry_points[name] for name in args.scripts}
+
+    results = run_startup_benchmark(entry_points, args.num_runs)
+    print(json.dumps(results, indent=2))
+
+    failures = compare_to_budgets(results, STARTUP_BUDGETS_MS, args.scale)
+    for failure in failures:
+        logging.error(f"Regression: {failure}")
+    if failures:
+        sys.exit(1)
+    logging.info("All scripts within their startup budgets")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,11 @@ from pathlib import Path
 
 import cv2
 
-from rubiks_cube_solver.constants import FACE_TO_POSITION, FACES_PATH
+from rubiks_cube_solver.constants import (
+    FACE_TO_POSITION,
+    FACES_PATH,
+    HOMOGRAPHIES_PATH,
+)
 from rubiks_cube_solver.cv import keep_windows_open, show_image
 from rubiks_cube_solver.types import (
     Coordinate,
@@ -139,6 +143,9 @@ def save_coordinates(face: Face, coordinates: list[Coordinate]):
     with open(FACES_PATH, "w") as f:
         json.dump(data, f)
 
+    # cached homographies are refit from the new manual calibration
+    HOMOGRAPHIES_PATH.unlink(missing_ok=True)
+
 
 if __name__ == "__main__":
     main()
@@ -18,9 +18,9 @@ def main():
         DEBUG_PATH.mkdir()
 
     for pos in Position:
-        img = perception.capture_image(pos)
-        cv2.imwrite(DEBUG_PATH / f"{pos}_rgb.jpg", img.rgb)
-        cv2.imwrite(DEBUG_PATH / f"{pos}_hsv.jpg", img.hsv)
+        with perception.captured_image(pos) as img:
+            cv2.imwrite(DEBUG_PATH / f"{pos}_rgb.jpg", img.rgb)
+            cv2.imwrite(DEBUG_PATH / f"{pos}_hsv.jpg", img.hsv)
 
 
 if __name__ == "__main__":
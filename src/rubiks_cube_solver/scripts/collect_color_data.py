@@ -8,6 +8,7 @@ import numpy as np
 
 from rubiks_cube_solver.constants import COLOR_NEIGHBORHOOD, COLORS_PATH
 from rubiks_cube_solver.cv import keep_windows_open, mask_by_hsv, show_image
+from rubiks_cube_solver.profiling import profile_main
 from rubiks_cube_solver.types import (
     Color,
     Image,
@@ -16,6 +17,7 @@ from rubiks_cube_solver.types import (
 from rubiks_cube_solver.utils import maybe_commit
 
 
+@profile_main
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -0,0 +1,39 @@
+import argparse
+from pathlib import Path
+
+from rubiks_cube_solver.profiling import diff_profiles, load_profile
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Compare two saved profiles")
+    parser.add_argument("before", type=str, help="Baseline .pstats/.collapsed")
+    parser.add_argument("after", type=str, help="New .pstats/.collapsed")
+    parser.add_argument(
+        "-n",
+        "--top",
+        required=False,
+        type=int,
+        default=20,
+        help="How many functions to show",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    before, after = Path(args.before), Path(args.after)
+    if before.suffix != after.suffix:
+        raise RuntimeError("Profiles must be of the same type")
+
+    rows = diff_profiles(load_profile(before), load_profile(after))
+
+    unit = "samples" if before.suffix == ".collapsed" else "s"
+    print(f"{'before':>12} {'after':>12} {'delta':>12}  function ({unit})")
+    for function, value_before, value_after in rows[: args.top]:
+        delta = value_after - value_before
+        print(f"{value_before:12.4f} {value_after:12.4f} {delta:+12.4f}  {function}")
+
+
+if __name__ == "__main__":
+    main()
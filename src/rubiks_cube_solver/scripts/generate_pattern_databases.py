@@ -0,0 +1,26 @@
+import argparse
+import logging
+
+from rubiks_cube_solver.constants import PATTERN_DATABASES_PATH
+from rubiks_cube_solver.optimal import generate_pattern_databases
+from rubiks_cube_solver.profiling import profile_main
+
+
+def parse_args():
+    # no output path: the solver always loads the databases from
+    # PATTERN_DATABASES_PATH
+    parser = argparse.ArgumentParser("Optimal solver pattern database generator")
+    args = parser.parse_args()
+    logging.info(f"Parsed args: {args}")
+    return args
+
+
+@profile_main
+def main():
+    parse_args()
+    generate_pattern_databases(PATTERN_DATABASES_PATH)
+    logging.info(f"Saved pattern databases to {PATTERN_DATABASES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from rubiks_cube_solver.move import save_scramble_corpus
+from rubiks_cube_solver.profiling import profile_main
+
+
+@dataclass
+class Args:
+    output: str
+    num_scrambles: int
+    num_moves: int
+    random_state: bool
+    chunk_size: int
+    random_seed: Optional[int] = None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Scramble corpus generator")
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        type=str,
+        help="Path to output .npy file",
+    )
+    parser.add_argument(
+        "--num-scrambles",
+        required=False,
+        type=int,
+        default=1_000_000,
+        help="How many scrambles to generate",
+    )
+    parser.add_argument(
+        "--num-moves",
+        required=False,
+        type=int,
+        default=20,
+        help="Moves per scramble (min width for random-state scrambles, which "
+        "are padded to fit kociemba's longest solutions)",
+    )
+    parser.add_argument(
+        "--random-state",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to generate scrambles of uniformly random cube states",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        required=False,
+        type=int,
+        default=100_000,
+        help="How many scrambles to generate per chunk written to disk",
+    )
+    parser.add_argument(
+        "--random-seed",
+        required=False,
+        type=int,
+        default=None,
+        help="Random seed",
+    )
+    args = parser.parse_args()
+    args = Args(**vars(args))
+    logging.info(f"Parsed args: {args}")
+    return args
+
+
+@profile_main
+def main():
+    args = parse_args()
+
+    save_scramble_corpus(
+        Path(args.output),
+        num_scrambles=args.num_scrambles,
+        num_moves=args.num_moves,
+        random_seed=args.random_seed,
+        random_state=args.random_state,
+        chunk_size=args.chunk_size,
+    )
+
+    logging.info(f"Saved {args.num_scrambles} scrambles to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import termios
 import tty
 
 from rubiks_cube_solver.arduino import Arduino
+from rubiks_cube_solver.tracking import CubeStateTracker
 
 
 def main():
@@ -11,6 +12,8 @@ def main():
 
     arduino = Arduino()
     arduino.wait_for_ready()
+    # jogs are not tracked, so after any the next scan has to be a full one
+    tracker = CubeStateTracker()
 
     def print_raw(*values: object):
         """Helper to achieve similar print behavior in raw mode"""
@@ -57,9 +60,11 @@ def main():
             else:
                 if key == "\x1b[D":  # Left arrow
                     print_raw(f"Axis {current_axis} -> LEFT")
+                    tracker.invalidate()
                     arduino.run_jog(current_axis + "'")
                 elif key == "\x1b[C":  # Right arrow
                     print_raw(f"Axis {current_axis} -> RIGHT")
+                    tracker.invalidate()
                     arduino.run_jog(current_axis)
                 elif key == "s":
                     current_axis = None
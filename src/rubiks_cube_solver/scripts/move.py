@@ -1,18 +1,23 @@
 import logging
 
 from rubiks_cube_solver.arduino import Arduino
+from rubiks_cube_solver.profiling import profile_main
+from rubiks_cube_solver.tracking import CubeStateTracker
 
 logger = logging.getLogger(__name__)
 
 
+@profile_main
 def main():
     arduino = Arduino()
     arduino.wait_for_ready()
+    tracker = CubeStateTracker()
 
     try:
         while True:
             move = input("Enter a move command: ")
-            arduino.run_move(move)
+            with tracker.track_moves([move]):
+                arduino.run_move(move)
     except KeyboardInterrupt:
         logger.info("Shutting down")
 
@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from rubiks_cube_solver.constants import DEBUG_PATH
+from rubiks_cube_solver.orchestration import Orchestrator
+from rubiks_cube_solver.profiling import profile_main
+from rubiks_cube_solver.rig import Rig, load_rig_configs
+from rubiks_cube_solver.tracking import CubeStateTracker
+
+
+@dataclass
+class Args:
+    rigs: list[str]
+    num_cycles: int
+    num_moves: int
+    solver_workers: int
+    cycle_timeout: float
+    simulate: int
+    move_delay: float
+    scan_delay: float
+    misread_rate: float
+    summary_path: str
+    summary_interval: float
+    debug: bool
+    random_seed: Optional[int] = None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Rubik's cube solver multi-rig orchestrator")
+    parser.add_argument(
+        "--rigs",
+        required=False,
+        type=str,
+        nargs="*",
+        default=[],
+        help="Names of the configured rigs to run (default: all)",
+    )
+    parser.add_argument(
+        "--num-cycles",
+        required=False,
+        type=int,
+        default=100,
+        help="How many shuffle/scan/solve/execute cycles to run per rig",
+    )
+    parser.add_argument(
+        "--num-moves",
+        required=False,
+        type=int,
+        default=20,
+        help="How many moves to use for shuffling",
+    )
+    parser.add_argument(
+        "--solver-workers",
+        required=False,
+        type=int,
+        default=2,
+        help="How many processes to solve with, shared by all rigs",
+    )
+    parser.add_argument(
+        "--cycle-timeout",
+        required=False,
+        type=float,
+        default=120.0,
+        help="Seconds after which a cycle counts as stalled",
+    )
+    parser.add_argument(
+        "--simulate",
+        required=False,
+        type=int,
+        default=0,
+        help="How many stubbed rigs to run instead of the configured rigs",
+    )
+    parser.add_argument(
+        "--move-delay",
+        required=False,
+        type=float,
+        default=0.0,
+        help="Simulated seconds per move",
+    )
+    parser.add_argument(
+        "--scan-delay",
+        required=False,
+        type=float,
+        default=0.0,
+        help="Simulated seconds per scan",
+    )
+    parser.add_argument(
+        "--misread-rate",
+        required=False,
+        type=float,
+        default=0.0,
+        help="Simulated probability of a scan misread",
+    )
+    parser.add_argument(
+        "--summary-path",
+        required=False,
+        type=str,
+        default=str(DEBUG_PATH / "orchestrate_summary.json"),
+        help="Where to write the rolling summary",
+    )
+    parser.add_argument(
+        "--summary-interval",
+        required=False,
+        type=float,
+        default=60.0,
+        help="Seconds between summary writes",
+    )
+    parser.add_argument(
+        "--debug",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to add debug logging",
+    )
+    parser.add_argument(
+        "--random-seed",
+        required=False,
+        type=int,
+        default=None,
+        help="Random seed",
+    )
+    args = parser.parse_args()
+    args = Args(**vars(args))
+    logging.info(f"Parsed args: {args}")
+    return args
+
+
+def get_simulated_rigs(args: Args, state_path: Path) -> list[Rig]:
+    from rubiks_cube_solver.simulation import SimulatedArduino, SimulatedPerception
+
+    rigs = []
+    seeds = np.random.SeedSequence(args.random_seed).spawn(args.simulate)
+    for i, seed in enumerate(seeds):
+        name = f"sim{i}"
+        arduino = SimulatedArduino(move_delay=args.move_delay)
+        perception = SimulatedPerception(
+            arduino,
+            scan_delay=args.scan_delay,
+            misread_rate=args.misread_rate,
+            rng=np.random.default_rng(seed),
+        )
+        tracker = CubeStateTracker(state_path / name / "cube_state.json")
+        rigs.append(Rig(name, arduino, perception, tracker))
+    return rigs
+
+
+@profile_main
+def main():
+    args = parse_args()
+
+    with ExitStack() as stack:
+        if args.simulate:
+            # simulated cube states are thrown away with the run, so they never
+            # stand in for the state of a real rig
+            state_path = stack.enter_context(
+                tempfile.TemporaryDirectory(prefix="simulated_rigs_")
+            )
+            rigs = get_simulated_rigs(args, Path(state_path))
+        else:
+            configs = load_rig_configs()
+            names = args.rigs or list(configs)
+            rigs = [Rig.from_config(configs[name], debug=args.debug) for name in names]
+
+        orchestrator = Orchestrator(
+            rigs,
+            num_moves=args.num_moves,
+            solver_workers=args.solver_workers,
+            cycle_timeout=args.cycle_timeout,
+            random_seed=args.random_seed,
+        )
+        summary = asyncio.run(
+            orchestrator.run(
+                args.num_cycles,
+                summary_path=Path(args.summary_path),
+                summary_interval=args.summary_interval,
+            )
+        )
+
+    logging.info(f"Orchestrator summary: {json.dumps(summary, indent=2)}")
+
+
+if __name__ == "__main__":
+    main()
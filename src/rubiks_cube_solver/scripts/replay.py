@@ -0,0 +1,93 @@
+import argparse
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+
+from rubiks_cube_solver.arduino import Arduino
+from rubiks_cube_solver.perception import Perception
+from rubiks_cube_solver.profiling import profile_main
+from rubiks_cube_solver.session import ReplaySerial, Session, get_replay_cameras
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Replay a recorded solve session offline")
+    parser.add_argument("session", type=str, help="Path to a recorded session")
+    parser.add_argument(
+        "-n",
+        "--num-runs",
+        required=False,
+        type=int,
+        default=1,
+        help="How many times to replay the scan, e.g. for benchmarking",
+    )
+    parser.add_argument(
+        "--lenient",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to count commands that differ from the recording "
+        "instead of failing on them",
+    )
+    parser.add_argument(
+        "--debug",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to add debug logging",
+    )
+    return parser.parse_args()
+
+
+@profile_main
+def main():
+    args = parse_args()
+    logging.info(f"Parsed args: {args}")
+
+    session = Session(Path(args.session))
+    logging.info(
+        f"Loaded session with {len(session.events)} events "
+        f"and {session.meta['num_frames']} frames"
+    )
+
+    # scan the way the session was recorded, sessions recorded before the
+    # scan parameters were saved did a full scan without settling
+    scan = session.meta.get("scan", {})
+    logging.info(f"Recorded scan parameters: {scan}")
+
+    # the replay serial and cameras are swapped in fresh for every run
+    arduino = Arduino(connection=ReplaySerial(session))
+    perception = Perception(
+        arduino,
+        debug=args.debug,
+        auto_calibrate=False,
+        undo_turns=scan.get("undo_turns", True),
+        settle=scan.get("settle", False),
+    )
+
+    cube_states = []
+    durations = []
+    num_mismatches = 0
+    for _ in range(args.num_runs):
+        arduino.serial = ReplaySerial(session, strict=not args.lenient)
+        perception.cameras = get_replay_cameras(session)
+
+        start = time.perf_counter()
+        arduino.wait_for_ready()
+        cube_states.append(perception.get_cube_state(expected=scan.get("expected")))
+        durations.append(time.perf_counter() - start)
+        num_mismatches += arduino.serial.num_mismatches
+
+    print(f"Cube state: {cube_states[0]}")
+    if len(set(cube_states)) > 1:
+        logging.warning(f"Replays disagree: {sorted(set(cube_states))}")
+    print(
+        f"Replayed scan {args.num_runs}x: mean {1000 * np.mean(durations):.1f}ms, "
+        f"min {1000 * np.min(durations):.1f}ms, "
+        f"command mismatches {num_mismatches}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ from typing import Optional
 
 from rubiks_cube_solver.arduino import Arduino
 from rubiks_cube_solver.move import get_random_moves, get_random_resolving_moves
+from rubiks_cube_solver.profiling import profile_main
+from rubiks_cube_solver.tracking import CubeStateTracker
 
 
 @dataclass
@@ -43,6 +45,7 @@ def parse_args():
     return args
 
 
+@profile_main
 def main():
     args = parse_args()
 
@@ -56,7 +59,8 @@ def main():
     else:
         moves = get_random_moves(num_moves=args.num_moves, random_seed=args.random_seed)
 
-    return arduino.run_moves(moves)
+    with CubeStateTracker().track_moves(moves):
+        return arduino.run_moves(moves)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+import argparse
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from rubiks_cube_solver.constants import DEBUG_PATH
+from rubiks_cube_solver.profiling import profile_main
+from rubiks_cube_solver.soak import SoakTest
+from rubiks_cube_solver.solver import SolverWarmup
+
+
+@dataclass
+class Args:
+    num_cycles: int
+    num_moves: int
+    simulate: bool
+    move_delay: float
+    scan_delay: float
+    misread_rate: float
+    summary_path: str
+    summary_every: int
+    settle: bool
+    debug: bool
+    random_seed: Optional[int] = None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Rubik's cube solver soak test")
+    parser.add_argument(
+        "--num-cycles",
+        required=False,
+        type=int,
+        default=100,
+        help="How many shuffle/scan/solve/verify cycles to run",
+    )
+    parser.add_argument(
+        "--num-moves",
+        required=False,
+        type=int,
+        default=20,
+        help="How many moves to use for shuffling",
+    )
+    parser.add_argument(
+        "--simulate",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to use stubbed hardware instead of the rig",
+    )
+    parser.add_argument(
+        "--move-delay",
+        required=False,
+        type=float,
+        default=0.0,
+        help="Simulated seconds per move",
+    )
+    parser.add_argument(
+        "--scan-delay",
+        required=False,
+        type=float,
+        default=0.0,
+        help="Simulated seconds per scan",
+    )
+    parser.add_argument(
+        "--misread-rate",
+        required=False,
+        type=float,
+        default=0.0,
+        help="Simulated probability of a scan misread",
+    )
+    parser.add_argument(
+        "--summary-path",
+        required=False,
+        type=str,
+        default=str(DEBUG_PATH / "soak_summary.json"),
+        help="Where to write the rolling summary",
+    )
+    parser.add_argument(
+        "--summary-every",
+        required=False,
+        type=int,
+        default=1,
+        help="How many cycles between summary writes",
+    )
+    parser.add_argument(
+        "--settle",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to wait for the facets to stop moving before each capture",
+    )
+    parser.add_argument(
+        "--debug",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to add debug logging",
+    )
+    parser.add_argument(
+        "--random-seed",
+        required=False,
+        type=int,
+        default=None,
+        help="Random seed",
+    )
+    args = parser.parse_args()
+    args = Args(**vars(args))
+    logging.info(f"Parsed args: {args}")
+    return args
+
+
+@profile_main
+def main():
+    args = parse_args()
+    warmup = SolverWarmup()
+
+    if args.simulate:
+        from rubiks_cube_solver.simulation import SimulatedArduino, SimulatedPerception
+
+        arduino = SimulatedArduino(move_delay=args.move_delay)
+        perception = SimulatedPerception(
+            arduino,
+            scan_delay=args.scan_delay,
+            misread_rate=args.misread_rate,
+            rng=np.random.default_rng(args.random_seed),
+        )
+    else:
+        from rubiks_cube_solver.arduino import Arduino
+        from rubiks_cube_solver.perception import Perception
+
+        arduino = Arduino()
+        perception = Perception(arduino, debug=args.debug, settle=args.settle)
+
+    arduino.wait_for_ready()
+    warmup.wait()
+
+    soak_test = SoakTest(
+        arduino, perception, args.num_moves, random_seed=args.random_seed
+    )
+    summary = soak_test.run(
+        args.num_cycles,
+        summary_path=Path(args.summary_path),
+        summary_every=args.summary_every,
+    )
+
+    logging.info(f"Soak summary: {json.dumps(summary, indent=2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 import argparse
 import logging
+import statistics
+import time
+from typing import TYPE_CHECKING
 
 from rubiks_cube_solver.arduino import Arduino
-from rubiks_cube_solver.perception import Perception
-from rubiks_cube_solver.solver import solve
+from rubiks_cube_solver.constants import SOLVERS
+from rubiks_cube_solver.profiling import profile_main
+from rubiks_cube_solver.tracking import CubeStateTracker
+
+if TYPE_CHECKING:
+    from rubiks_cube_solver.perception import Perception
+    from rubiks_cube_solver.solver import SolverWarmup
 
 
 def parse_args():
@@ -15,28 +23,131 @@ def parse_args():
         default=False,
         help="Whether to add debug logging",
     )
+    parser.add_argument(
+        "--serial-moves",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to run opposite-face moves one at a time",
+    )
+    parser.add_argument(
+        "--solver",
+        required=False,
+        type=str,
+        choices=SOLVERS,
+        default="kociemba",
+        help="Which solver to use, the optimal one is for short scrambles (about "
+        "10 moves) and falls back to kociemba on longer ones",
+    )
+    parser.add_argument(
+        "--keep-turns",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to leave faces turned after scanning and solve from there",
+    )
+    parser.add_argument(
+        "--settle",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to wait for the facets to stop moving before each capture",
+    )
+    parser.add_argument(
+        "--record",
+        required=False,
+        action="store_true",
+        default=False,
+        help="Whether to record serial traffic and frames for replay",
+    )
     return parser.parse_args()
 
 
+@profile_main
 def main():
     args = parse_args()
     logging.info(f"Parsed args: {args}")
 
+    # the Arduino resets when the port opens, so open it before importing
+    # the solver and OpenCV/scikit-learn to overlap them with its boot
     arduino = Arduino()
-    arduino.wait_for_ready()
 
-    perception = Perception(arduino, debug=args.debug)
+    from rubiks_cube_solver.solver import SolverWarmup
+
+    # load the solver tables while the Arduino boots and the cameras are set up
+    warmup = SolverWarmup(args.solver)
+
+    from rubiks_cube_solver.perception import Perception
+    from rubiks_cube_solver.session import (
+        get_scan_meta,
+        get_session_path,
+        record_session,
+    )
+
+    perception = Perception(
+        arduino,
+        debug=args.debug,
+        undo_turns=not args.keep_turns,
+        settle=args.settle,
+    )
 
-    cube_state = perception.get_cube_state()
+    tracker = CubeStateTracker()
+    if not args.record:
+        return run(arduino, perception, tracker, args.solver, args.serial_moves, warmup)
+
+    # the scan confirms the tracked state, replay has to expect it too
+    meta = {"scan": get_scan_meta(perception, expected=tracker.cube_state)}
+    with record_session(arduino, perception, get_session_path(), meta):
+        return run(arduino, perception, tracker, args.solver, args.serial_moves, warmup)
+
+
+def run(
+    arduino: Arduino,
+    perception: "Perception",
+    tracker: CubeStateTracker,
+    solver: str,
+    serial_moves: bool,
+    warmup: "SolverWarmup",
+):
+    from rubiks_cube_solver.schedule import get_schedule_report, schedule_moves
+    from rubiks_cube_solver.solver import solve
+
+    arduino.wait_for_ready()
+
+    cube_state = tracker.scan(perception)
     logging.debug(f"Got cube state: {cube_state}")
+    if perception.settle_times:
+        settle_ms = [1000 * settle_time for settle_time in perception.settle_times]
+        logging.info(
+            f"{len(settle_ms)} captures settled in mean "
+            f"{statistics.fmean(settle_ms):.0f}ms, max {max(settle_ms):.0f}ms, "
+            f"{perception.num_settle_timeouts} timeouts"
+        )
 
     response = input("Solve? (y/n): ")
     if response.strip().lower() != "y":
         logging.info("Quitting")
         return
 
-    moves = solve(cube_state)
-    return arduino.run_moves(moves)
+    warmup.wait()
+    start = time.perf_counter()
+    moves = solve(cube_state, solver=solver)
+    logging.info(
+        f"Solved in {1000 * (time.perf_counter() - start):.1f}ms, {len(moves)} moves"
+    )
+    if serial_moves:
+        with tracker.track_moves(moves):
+            return arduino.run_moves(moves)
+
+    schedule = schedule_moves(moves)
+    report = get_schedule_report(schedule)
+    logging.info(
+        f"Running {report.num_moves} moves in {report.num_steps} steps, "
+        f"predicted {report.serial_time:.2f}s -> {report.parallel_time:.2f}s "
+        f"(saves {report.saved_time:.2f}s)"
+    )
+    with tracker.track_moves(moves):
+        return arduino.run_schedule(schedule)
 
 
 if __name__ == "__main__":
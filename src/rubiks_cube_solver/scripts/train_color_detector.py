@@ -8,6 +8,7 @@ from sklearn.model_selection import cross_val_score, train_test_split
 from sklearn.neighbors import KNeighborsClassifier
 
 from rubiks_cube_solver.constants import COLOR_TO_CLASS, COLORS_PATH, MODEL_PATH
+from rubiks_cube_solver.profiling import profile_main
 from rubiks_cube_solver.types import Color
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,7 @@ MIN_NEIGHBORS = 1
 MAX_NEIGHBORS = 10
 
 
+@profile_main
 def main():
     with open(COLORS_PATH, "r") as f:
         data: dict[str, list[list[float]]] = json.load(f)
@@ -0,0 +1,270 @@
+import json
+import logging
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from rubiks_cube_solver.constants import DEBUG_PATH
+from rubiks_cube_solver.types import Position
+
+SESSIONS_DIR = DEBUG_PATH / "sessions"
+EVENTS_FILE = "events.jsonl"
+FRAMES_FILE = "frames.bin"
+META_FILE = "meta.json"
+
+
+def get_session_path() -> Path:
+    return SESSIONS_DIR / time.strftime("%Y%m%d-%H%M%S")
+
+
+class SessionRecorder:
+    """Records serial traffic and captured frames into a session directory.
+
+    Events are appended to a JSON lines file, frames are appended raw to a
+    single binary file that `Session` memory-maps as one (n, h, w, 3) array.
+    `meta` is saved with the session, e.g. the scan parameters replay needs.
+    """
+
+    def __init__(self, path: Path, meta: dict = None):
+        path.mkdir(parents=True, exist_ok=False)
+        self.path = path
+        self.meta = meta or {}
+        self.start_time = time.perf_counter()
+        self.wall_time = time.time()
+        self.events = open(path / EVENTS_FILE, "w")
+        self.frames = open(path / FRAMES_FILE, "wb")
+        self.frame_shape: tuple[int, ...] = None
+        self.num_frames = 0
+
+    def write_event(self, event: dict):
+        event["time"] = time.perf_counter() - self.start_time
+        self.events.write(json.dumps(event) + "\n")
+
+    def record_write(self, data: bytes):
+        self.write_event({"type": "write", "data": data.decode(errors="replace")})
+
+    def record_read(self, data: bytes):
+        self.write_event({"type": "read", "data": data.decode(errors="replace")})
+
+    def record_frame(self, position: Position, frame: np.ndarray, duration: float):
+        if self.frame_shape is None:
+            self.frame_shape = frame.shape
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Expected frame of shape {self.frame_shape}")
+
+        self.frames.write(np.ascontiguousarray(frame, dtype=np.uint8).tobytes())
+        self.write_event(
+            {
+                "type": "frame",
+                "position": position.value,
+                "index": self.num_frames,
+                "duration": duration,
+            }
+        )
+        self.num_frames += 1
+
+    def close(self):
+        self.events.close()
+        self.frames.close()
+        with open(self.path / META_FILE, "w") as f:
+            json.dump(
+                {
+                    **self.meta,
+                    "wall_time": self.wall_time,
+                    "num_frames": self.num_frames,
+                    "frame_shape": self.frame_shape,
+                },
+                f,
+            )
+        logging.info(f"Recorded session to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class RecordingSerial:
+    """Wraps a serial connection, recording everything written and read"""
+
+    def __init__(self, connection, recorder: SessionRecorder):
+        self.connection = connection
+        self.recorder = recorder
+
+    def write(self, data: bytes):
+        self.recorder.record_write(data)
+        return self.connection.write(data)
+
+    def readline(self) -> bytes:
+        data = self.connection.readline()
+        if data:
+            self.recorder.record_read(data)
+        return data
+
+    def reset_input_buffer(self):
+        self.recorder.write_event({"type": "drain"})
+        return self.connection.reset_input_buffer()
+
+    @property
+    def in_waiting(self) -> int:
+        return self.connection.in_waiting
+
+    @property
+    def out_waiting(self) -> int:
+        return self.connection.out_waiting
+
+
+class RecordingCamera:
+    def __init__(self, camera, position: Position, recorder: SessionRecorder):
+        self.camera = camera
+        self.position = position
+        self.recorder = recorder
+
+    def read(self, flush: bool = True, dst: np.ndarray = None) -> np.ndarray:
+        start = time.perf_counter()
+        frame = self.camera.read(flush=flush, dst=dst)
+        self.recorder.record_frame(
+            self.position, frame, duration=time.perf_counter() - start
+        )
+        return frame
+
+    def release(self):
+        self.camera.release()
+
+
+def get_scan_meta(perception, expected: str = None) -> dict:
+    """Parameters replay needs to scan a recorded session the same way"""
+    return {
+        "expected": expected,
+        "undo_turns": perception.undo_turns,
+        "settle": perception.settle,
+    }
+
+
+def record_session(
+    arduino, perception, path: Path, meta: dict = None
+) -> SessionRecorder:
+    """Start recording the serial traffic and frames of an Arduino/Perception"""
+    recorder = SessionRecorder(path, meta)
+    arduino.serial = RecordingSerial(arduino.serial, recorder)
+    if perception is not None:
+        perception.cameras = {
+            position: RecordingCamera(camera, position, recorder)
+            for position, camera in perception.cameras.items()
+        }
+    return recorder
+
+
+class Session:
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path / META_FILE) as f:
+            self.meta = json.load(f)
+        with open(path / EVENTS_FILE) as f:
+            self.events = [json.loads(line) for line in f]
+
+        self.frames = None
+        if self.meta["num_frames"] > 0:
+            self.frames = np.memmap(
+                path / FRAMES_FILE,
+                dtype=np.uint8,
+                mode="r",
+                shape=(self.meta["num_frames"], *self.meta["frame_shape"]),
+            )
+
+    def get_frame_indices(self, position: Position) -> list[int]:
+        return [
+            event["index"]
+            for event in self.events
+            if event["type"] == "frame" and event["position"] == position.value
+        ]
+
+
+class ReplayMismatchError(RuntimeError):
+    pass
+
+
+class ReplaySerial:
+    """Serial stand-in answering writes with the lines recorded after them.
+
+    Reads return the lines the Arduino sent after the matching write, and
+    an empty read (a timeout) once those are used up, without waiting.
+    """
+
+    def __init__(self, session: Session, strict: bool = True):
+        self.events = deque(e for e in session.events if e["type"] != "frame")
+        self.pending: deque[bytes] = deque()
+        self.strict = strict
+        self.num_mismatches = 0
+        self._take_reads()
+
+    def _take_reads(self):
+        while self.events and self.events[0]["type"] == "read":
+            self.pending.append(self.events.popleft()["data"].encode())
+
+    def write(self, data: bytes):
+        # skip reads and drains the replayed code did not ask for
+        while self.events and self.events[0]["type"] != "write":
+            self.events.popleft()
+        if not self.events:
+            raise ReplayMismatchError(f"Session has no write left for {data}")
+
+        recorded = self.events.popleft()["data"]
+        if recorded != data.decode(errors="replace"):
+            self.num_mismatches += 1
+            error = f"Wrote {data}, session recorded {recorded.encode()}"
+            if self.strict:
+                raise ReplayMismatchError(error)
+            logging.warning(error)
+
+        self.pending.clear()
+        self._take_reads()
+        return len(data)
+
+    def readline(self) -> bytes:
+        if self.pending:
+            return self.pending.popleft()
+        return b""
+
+    def reset_input_buffer(self):
+        self.pending.clear()
+        if self.events and self.events[0]["type"] == "drain":
+            self.events.popleft()
+            self._take_reads()
+
+    @property
+    def in_waiting(self) -> int:
+        return sum(len(line) for line in self.pending)
+
+    @property
+    def out_waiting(self) -> int:
+        return 0
+
+
+class ReplayCamera:
+    """Returns the frames recorded for a position, in order"""
+
+    def __init__(self, session: Session, position: Position):
+        self.session = session
+        self.indices = iter(session.get_frame_indices(position))
+
+    def read(self, flush: bool = True, dst: np.ndarray = None) -> np.ndarray:
+        index = next(self.indices, None)
+        if index is None:
+            raise OSError("Session has no frame left")
+        frame = self.session.frames[index]
+        if dst is not None and dst.shape == frame.shape:
+            np.copyto(dst, frame)
+            return dst
+        return np.array(frame)
+
+    def release(self):
+        pass
+
+
+def get_replay_cameras(session: Session) -> dict[Position, ReplayCamera]:
+    return {position: ReplayCamera(session, position) for position in Position}
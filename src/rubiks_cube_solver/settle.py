@@ -0,0 +1,70 @@
+import logging
+import time
+from typing import Iterable
+
+import cv2
+import numpy as np
+
+from rubiks_cube_solver.constants import (
+    CALIBRATION_SIZE,
+    COLOR_NEIGHBORHOOD,
+    SETTLE_FRAMES,
+    SETTLE_THRESHOLD,
+    SETTLE_TIMEOUT,
+)
+from rubiks_cube_solver.types import Coordinate, SettledFrame
+
+
+def get_facet_patches(
+    frame: np.ndarray, coordinates: Iterable[Coordinate]
+) -> np.ndarray:
+    """Stack the patches the facet colors are read from"""
+    if frame.shape[1::-1] != CALIBRATION_SIZE:
+        frame = cv2.resize(frame, CALIBRATION_SIZE)
+    return np.stack(
+        [
+            frame[
+                c.y - COLOR_NEIGHBORHOOD : c.y + COLOR_NEIGHBORHOOD,
+                c.x - COLOR_NEIGHBORHOOD : c.x + COLOR_NEIGHBORHOOD,
+            ]
+            for c in coordinates
+        ]
+    ).astype(np.int16)
+
+
+def read_settled_frame(
+    camera,
+    coordinates: Iterable[Coordinate],
+    timeout: float = SETTLE_TIMEOUT,
+    threshold: float = SETTLE_THRESHOLD,
+    num_still_frames: int = SETTLE_FRAMES,
+    dst: np.ndarray = None,
+) -> SettledFrame:
+    """Read frames until the facet patches stop changing.
+
+    Consecutive frames are differenced in the calibrated facet patches only,
+    so motion elsewhere in the view does not delay the capture. The first
+    frame after `num_still_frames` still differences is returned, or the
+    last one read when `timeout` passes first.
+    """
+    coordinates = list(coordinates)
+    start = time.perf_counter()
+    frame = camera.read(dst=dst)
+    patches = get_facet_patches(frame, coordinates)
+    num_frames, num_still = 1, 0
+    while num_still < num_still_frames:
+        if time.perf_counter() - start > timeout:
+            logging.warning(f"Facets still moving after {timeout}s")
+            return SettledFrame(frame, time.perf_counter() - start, num_frames, False)
+
+        # buffered frames were dropped by the first read
+        frame = camera.read(flush=False, dst=dst)
+        next_patches = get_facet_patches(frame, coordinates)
+        difference = np.abs(next_patches - patches).mean()
+        patches = next_patches
+        num_frames += 1
+        num_still = num_still + 1 if difference < threshold else 0
+
+    settle_time = time.perf_counter() - start
+    logging.debug(f"Facets settled in {1000 * settle_time:.1f}ms, {num_frames} frames")
+    return SettledFrame(frame, settle_time, num_frames, True)
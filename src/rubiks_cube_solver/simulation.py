@@ -0,0 +1,123 @@
+import logging
+import time
+from collections.abc import Iterable
+
+import numpy as np
+
+from rubiks_cube_solver.constants import POSITION_TO_FACES
+from rubiks_cube_solver.cube import SOLVED_STATE, apply_moves
+from rubiks_cube_solver.move import (
+    Move,
+    Moves,
+    as_moves,
+    decode_moves,
+    get_move_code,
+    to_move_string,
+)
+from rubiks_cube_solver.types import Position, Status
+
+
+class SimulatedArduino:
+    """Stand-in for `Arduino` that tracks the cube state in software"""
+
+    def __init__(self, move_delay: float = 0.0, cube_state: str = SOLVED_STATE):
+        self.move_delay = move_delay
+        self.cube_state = cube_state
+        self.move_prefix = "MOVE:"
+        self.parallel_move_prefix = "MOVES:"
+        self.light_prefix = "LIGHT:"
+        self.jog_prefix = "JOG:"
+
+    def write_line_and_wait_for_response(self, message: str):
+        logging.debug(f"Simulated: {message}")
+        if message.startswith(self.move_prefix):
+            move = message.removeprefix(self.move_prefix)
+            self.cube_state = apply_moves(self.cube_state, [move])
+            time.sleep(self.move_delay)
+        elif message.startswith(self.parallel_move_prefix):
+            moves = message.removeprefix(self.parallel_move_prefix).split(",")
+            self.cube_state = apply_moves(self.cube_state, moves)
+            time.sleep(self.move_delay)
+        return f"DONE:{message}"
+
+    def wait_for_ready(self):
+        logging.info("Simulated Arduino ready")
+
+    def run_move(self, move: Move):
+        move = to_move_string(move)
+        return self.write_line_and_wait_for_response(self.move_prefix + move)
+
+    def run_moves(self, moves: Moves):
+        for move in as_moves(moves):
+            self.run_move(move)
+
+    def run_parallel_moves(self, moves: Moves):
+        moves = decode_moves(as_moves(moves))
+        if len(moves) == 1:
+            return self.run_move(moves[0])
+        command = self.parallel_move_prefix + ",".join(moves)
+        return self.write_line_and_wait_for_response(command)
+
+    def run_schedule(self, schedule: Iterable[Moves]):
+        for step in schedule:
+            self.run_parallel_moves(step)
+
+    def turn_light_on(self, position: Position):
+        self.send_light_command(position, Status.ON)
+
+    def turn_light_off(self, position: Position):
+        self.send_light_command(position, Status.OFF)
+
+    def send_light_command(self, position: Position, status: Status):
+        command = self.light_prefix + position.value + status.value
+        return self.write_line_and_wait_for_response(command)
+
+    def run_jog(self, jog: str):
+        return self.write_line_and_wait_for_response(self.jog_prefix + jog)
+
+
+class SimulatedPerception:
+    """Stand-in for `Perception` that reads the simulated cube state.
+
+    With `misread_rate > 0`, scans randomly swap two non-center facelets to
+    exercise scan failure and recovery paths. Without `undo_turns`, scans
+    leave the faces turned like `Perception` does.
+    """
+
+    def __init__(
+        self,
+        arduino: SimulatedArduino,
+        scan_delay: float = 0.0,
+        misread_rate: float = 0.0,
+        rng: np.random.Generator = None,
+        undo_turns: bool = True,
+    ):
+        self.arduino = arduino
+        self.scan_delay = scan_delay
+        self.misread_rate = misread_rate
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.undo_turns = undo_turns
+
+    def get_cube_state(self, expected: str = None):
+        if expected is not None and expected == self.arduino.cube_state:
+            return expected
+
+        time.sleep(self.scan_delay)
+        if not self.undo_turns:
+            self.arduino.run_moves(
+                np.array(
+                    [
+                        get_move_code(face.value, "2")
+                        for position in [Position.LOWER, Position.UPPER]
+                        for face in POSITION_TO_FACES[position]
+                    ],
+                    dtype=np.uint8,
+                )
+            )
+        cube_state = list(self.arduino.cube_state)
+        if self.rng.random() < self.misread_rate:
+            i, j = self.rng.choice(
+                [i for i in range(len(cube_state)) if i % 9 != 4], size=2, replace=False
+            )
+            cube_state[i], cube_state[j] = cube_state[j], cube_state[i]
+        return "".join(cube_state)
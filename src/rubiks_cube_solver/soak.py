@@ -0,0 +1,204 @@
+import json
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from rubiks_cube_solver.cube import SOLVED_STATE, apply_moves, is_solved
+from rubiks_cube_solver.move import generate_scrambles
+from rubiks_cube_solver.schedule import get_schedule_report, schedule_moves
+from rubiks_cube_solver.solver import solve
+
+
+@dataclass
+class SoakStats:
+    start_time: float = field(default_factory=time.perf_counter)
+    cycles: int = 0
+    successes: int = 0
+    scans: int = 0
+    scan_failures: int = 0
+    mismatches: int = 0
+    verify_failures: int = 0
+    recoveries: int = 0
+    link_resyncs: int = 0
+    errors: int = 0
+    stalls: int = 0
+    settle_timeouts: int = 0
+    face_rescans: int = 0
+    peak_frame_bytes: int = 0
+    predicted_saved_time: float = 0.0
+    stage_times: dict[str, list[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+
+    def record(self, stage: str, seconds: float):
+        self.stage_times[stage].append(seconds)
+
+    def update_perception_stats(self, perception):
+        """Copy the capture telemetry of a perception, if it keeps any"""
+        self.face_rescans = getattr(perception, "num_face_rescans", 0)
+        self.peak_frame_bytes = max(
+            getattr(perception, "peak_frame_bytes", []), default=0
+        )
+        settle_times = getattr(perception, "settle_times", None)
+        if settle_times:
+            self.stage_times["settle"] = list(settle_times)
+            self.settle_timeouts = perception.num_settle_timeouts
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.start_time
+        stages = {}
+        for stage, times in self.stage_times.items():
+            times = np.array(times)
+            stages[stage] = {
+                "count": len(times),
+                "mean_ms": 1000 * times.mean(),
+                "p50_ms": 1000 * np.percentile(times, 50),
+                "p95_ms": 1000 * np.percentile(times, 95),
+                "max_ms": 1000 * times.max(),
+            }
+        return {
+            "elapsed_s": elapsed,
+            "cycles": self.cycles,
+            "successes": self.successes,
+            "cycles_per_hour": 3600 * self.cycles / elapsed if elapsed else 0.0,
+            "scan_failure_rate": self.scan_failures / max(self.scans, 1),
+            "mismatch_rate": self.mismatches / max(self.scans, 1),
+            "verify_failure_rate": self.verify_failures / max(self.cycles, 1),
+            "recoveries": self.recoveries,
+            "link_resyncs": self.link_resyncs,
+            "errors": self.errors,
+            "stalls": self.stalls,
+            "settle_timeouts": self.settle_timeouts,
+            "face_rescans": self.face_rescans,
+            "peak_frame_mb": self.peak_frame_bytes / 2**20,
+            "predicted_saved_s": self.predicted_saved_time,
+            "stages": stages,
+        }
+
+
+class Timed:
+    def __init__(self, stats: SoakStats, stage: str):
+        self.stats = stats
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def write_summary(summary: dict, summary_path: Path):
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = summary_path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    tmp_path.replace(summary_path)
+
+
+class SoakTest:
+    """Runs unattended shuffle -> scan -> solve -> verify cycles"""
+
+    def __init__(
+        self,
+        arduino,
+        perception,
+        num_moves: int = 20,
+        max_recovery_attempts: int = 2,
+        random_seed: int = None,
+    ):
+        self.arduino = arduino
+        self.perception = perception
+        self.num_moves = num_moves
+        self.max_recovery_attempts = max_recovery_attempts
+        self.rng = np.random.default_rng(random_seed)
+        self.stats = SoakStats()
+        # Best known physical state, None when it is unknown
+        self.expected_state: str = SOLVED_STATE
+
+    def scan(self) -> str:
+        with Timed(self.stats, "scan"):
+            cube_state = self.perception.get_cube_state()
+        self.stats.scans += 1
+        if self.expected_state is not None and cube_state != self.expected_state:
+            self.stats.mismatches += 1
+            logging.warning(f"Scan mismatch: {cube_state=}, {self.expected_state=}")
+        return cube_state
+
+    def scan_and_solve(self) -> np.ndarray:
+        for attempt in range(self.max_recovery_attempts + 1):
+            if attempt > 0:
+                self.stats.recoveries += 1
+                logging.warning(f"Recovering: rescan attempt {attempt}")
+            cube_state = self.scan()
+            try:
+                with Timed(self.stats, "solve"):
+                    return solve(cube_state)
+            except ValueError:
+                # the scan is not a valid cube state
+                self.stats.scan_failures += 1
+                logging.warning(f"Unable to solve scanned state: {cube_state}")
+        raise RuntimeError("Unable to scan a solvable cube state")
+
+    def run_cycle(self):
+        moves = generate_scrambles(1, self.num_moves, self.rng)[0]
+        with Timed(self.stats, "shuffle"):
+            self.arduino.run_moves(moves)
+        if self.expected_state is not None:
+            self.expected_state = apply_moves(self.expected_state, moves)
+
+        self.stats.cycles += 1
+        try:
+            solution = self.scan_and_solve()
+        except RuntimeError:
+            logging.exception("Cycle failed during scan")
+            self.expected_state = None
+            return
+
+        schedule = schedule_moves(solution)
+        self.stats.predicted_saved_time += get_schedule_report(schedule).saved_time
+        with Timed(self.stats, "execute"):
+            self.arduino.run_schedule(schedule)
+
+        self.expected_state = SOLVED_STATE
+        for attempt in range(self.max_recovery_attempts + 1):
+            if attempt > 0:
+                self.stats.recoveries += 1
+                logging.warning(f"Recovering: reverify attempt {attempt}")
+            with Timed(self.stats, "verify"):
+                cube_state = self.perception.get_cube_state()
+            if is_solved(cube_state):
+                self.stats.successes += 1
+                return
+
+        self.stats.verify_failures += 1
+        self.expected_state = None
+        logging.warning(f"Cube not solved after execution: {cube_state}")
+
+    def run(
+        self,
+        num_cycles: int,
+        summary_path: Path = None,
+        summary_every: int = 1,
+    ) -> dict:
+        for cycle in range(num_cycles):
+            self.run_cycle()
+            self.stats.link_resyncs = getattr(self.arduino, "num_resyncs", 0)
+            self.stats.update_perception_stats(self.perception)
+            logging.info(
+                f"Cycle {cycle + 1}/{num_cycles}: "
+                f"{self.stats.successes} solved, {self.stats.recoveries} recoveries"
+            )
+            if summary_path is not None and (cycle + 1) % summary_every == 0:
+                write_summary(self.stats.summary(), summary_path)
+
+        if summary_path is not None:
+            write_summary(self.stats.summary(), summary_path)
+
+        return self.stats.summary()
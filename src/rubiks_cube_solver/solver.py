@@ -1,10 +1,130 @@
-from typing import Iterable
+import logging
+import threading
+import time
+from pathlib import Path
 
-from kociemba import solve as _solve
+import numpy as np
 
+from rubiks_cube_solver.constants import (
+    OPTIMAL_MAX_NODES,
+    OPTIMAL_TIME_LIMIT,
+    PATTERN_DATABASES_PATH,
+)
+from rubiks_cube_solver.cube import SOLVED_STATE, apply_moves
+from rubiks_cube_solver.move import encode_moves, get_random_moves
+from rubiks_cube_solver.validation import validate_cube_state
+
+
+def solve_kociemba(cube_state: str) -> np.ndarray:
+    from kociemba import solve as _solve
 
-def solve(cube_state: str) -> Iterable[str]:
     solution = _solve(cube_state)
     if not isinstance(solution, str):
         raise Exception("Unable to solve cube")
-    return solution.split(" ")
+    return encode_moves(solution.split(" "))
+
+
+def solve(
+    cube_state: str,
+    solver: str = "kociemba",
+    max_nodes: int = OPTIMAL_MAX_NODES,
+    time_limit: float = OPTIMAL_TIME_LIMIT,
+) -> np.ndarray:
+    # kociemba does not reject every impossible state, and its errors do
+    # not say what is wrong
+    validation = validate_cube_state(cube_state)
+    if not validation.valid:
+        raise ValueError(f"Invalid cube state: {'; '.join(validation.errors)}")
+
+    if solver == "optimal":
+        from rubiks_cube_solver.optimal import SearchBudgetExceeded, solve_optimal
+
+        try:
+            return solve_optimal(cube_state, max_nodes, time_limit)
+        except SearchBudgetExceeded as e:
+            logging.warning(
+                f"{e}, falling back to kociemba. The optimal solver only "
+                "finishes states about 10 moves or fewer from solved"
+            )
+    elif solver != "kociemba":
+        raise ValueError(f"Unknown solver: {solver}")
+
+    return solve_kociemba(cube_state)
+
+
+def get_solver_tables(solver: str = "kociemba") -> dict[str, int]:
+    """Size in bytes of each table directory a solver loads, by path"""
+    import kociemba
+
+    # the native kociemba build caches its pruning tables next to the package
+    paths = [Path(kociemba.__file__).parent / "cprunetables"]
+    if solver == "optimal":
+        paths.append(PATTERN_DATABASES_PATH)
+    return {
+        str(path): sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+        if path.exists()
+        else 0
+        for path in paths
+    }
+
+
+def warm_up_solver(solver: str = "kociemba") -> dict:
+    """Solve a fixed scramble twice, loading the solver's tables on the first
+    solve, and return both latencies"""
+    # short enough for the optimal search to finish well within its budget
+    cube_state = apply_moves(SOLVED_STATE, get_random_moves(8, random_seed=0))
+    latencies = []
+    for _ in range(2):
+        start = time.perf_counter()
+        solve(cube_state, solver=solver)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "solver": solver,
+        "cold_ms": 1000 * latencies[0],
+        "warm_ms": 1000 * latencies[1],
+        "tables": get_solver_tables(solver),
+    }
+
+
+class SolverWarmup:
+    """Warms the solver up in a background thread.
+
+    Started at process start, the table loading overlaps with connecting to
+    the Arduino and setting up the cameras instead of delaying the first
+    solve. kociemba releases the GIL while it searches, but the optimal
+    solver's search is Python and NumPy, and holds it while overlapping.
+    """
+
+    def __init__(self, solver: str = "kociemba"):
+        self.solver = solver
+        self.results: dict = None
+        self.thread = threading.Thread(
+            target=self.run, name="solver-warmup", daemon=True
+        )
+        self.thread.start()
+
+    def run(self):
+        try:
+            self.results = warm_up_solver(self.solver)
+        except (ImportError, OSError, ValueError):
+            # a missing solver or tables only cost the first solve its speed
+            logging.exception("Solver warm-up failed")
+            return
+
+        tables = ", ".join(
+            f"{path} ({size / 2**20:.1f}MB)"
+            for path, size in self.results["tables"].items()
+        )
+        logging.info(
+            f"Solver warm: cold {self.results['cold_ms']:.1f}ms, "
+            f"warm {self.results['warm_ms']:.1f}ms, tables {tables}"
+        )
+
+    def wait(self, timeout: float = None) -> bool:
+        """Wait for the warm-up, returning whether it finished"""
+        start = time.perf_counter()
+        self.thread.join(timeout)
+        waited = time.perf_counter() - start
+        if waited > 0.001:
+            logging.info(f"Waited {1000 * waited:.0f}ms for the solver warm-up")
+        return not self.thread.is_alive()
@@ -0,0 +1,113 @@
+import json
+import socket
+import time
+from collections import Counter
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+import numpy as np
+
+from rubiks_cube_solver.cube import SOLVED_STATE, apply_moves
+from rubiks_cube_solver.move import generate_scrambles, get_move_amounts, get_rng
+from rubiks_cube_solver.profiling import get_git_revision
+from rubiks_cube_solver.solver import solve
+
+
+def get_kociemba_version() -> str:
+    try:
+        return version("kociemba")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def run_solver_benchmark(
+    num_scrambles: int,
+    num_moves: int,
+    random_seed: int = 0,
+    solver: str = "kociemba",
+    num_warmup: int = 5,
+) -> dict:
+    """Solve a fixed-seed scramble corpus and summarize latency and solutions"""
+    scrambles = generate_scrambles(num_scrambles, num_moves, get_rng(random_seed))
+    cube_states = [apply_moves(SOLVED_STATE, scramble) for scramble in scrambles]
+
+    # the first solves load kociemba's tables, keep them out of the latencies
+    for cube_state in cube_states[:num_warmup]:
+        solve(cube_state, solver=solver)
+
+    latencies, solutions = [], []
+    for cube_state in cube_states:
+        start = time.perf_counter()
+        solution = solve(cube_state, solver=solver)
+        latencies.append(time.perf_counter() - start)
+        solutions.append(solution)
+
+    latencies_ms = 1000 * np.array(latencies)
+    lengths = [len(solution) for solution in solutions]
+    amounts = get_move_amounts(np.concatenate(solutions))
+    return {
+        "solver": solver,
+        "num_scrambles": num_scrambles,
+        "num_moves": num_moves,
+        "random_seed": random_seed,
+        "revision": get_git_revision(),
+        "host": socket.gethostname(),
+        "kociemba_version": get_kociemba_version(),
+        "latency_ms": {
+            "mean": latencies_ms.mean(),
+            "p50": np.percentile(latencies_ms, 50),
+            "p95": np.percentile(latencies_ms, 95),
+            "p99": np.percentile(latencies_ms, 99),
+            "max": latencies_ms.max(),
+        },
+        "solution_length": {
+            "mean": float(np.mean(lengths)),
+            "max": int(np.max(lengths)),
+            "histogram": {
+                str(length): count for length, count in sorted(Counter(lengths).items())
+            },
+        },
+        "half_turn_fraction": float((amounts == 2).mean()) if len(amounts) else 0.0,
+    }
+
+
+def compare_to_baseline(
+    results: dict,
+    baseline: dict,
+    max_latency_ratio: float = 1.25,
+    max_length_increase: float = 0.25,
+) -> list[str]:
+    """Return a description of every threshold the results cross"""
+    failures = []
+    for key in ["solver", "num_scrambles", "num_moves", "random_seed"]:
+        if results[key] != baseline[key]:
+            failures.append(
+                f"{key} {results[key]} differs from baseline {baseline[key]}"
+            )
+
+    for stat in ["p50", "p95"]:
+        ratio = results["latency_ms"][stat] / baseline["latency_ms"][stat]
+        if ratio > max_latency_ratio:
+            failures.append(
+                f"{stat} latency {results['latency_ms'][stat]:.2f}ms is {ratio:.2f}x "
+                f"baseline {baseline['latency_ms'][stat]:.2f}ms"
+            )
+
+    increase = results["solution_length"]["mean"] - baseline["solution_length"]["mean"]
+    if increase > max_length_increase:
+        failures.append(
+            f"mean solution length {results['solution_length']['mean']:.2f} is "
+            f"{increase:.2f} moves longer than baseline"
+        )
+    return failures
+
+
+def load_baseline(path: Path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
@@ -0,0 +1,79 @@
+import subprocess
+import sys
+import tomllib
+from collections import defaultdict
+
+from rubiks_cube_solver.constants import ROOT_PATH
+
+
+def get_entry_points() -> dict[str, str]:
+    """Module of every console script, by script name"""
+    with open(ROOT_PATH / "pyproject.toml", "rb") as f:
+        scripts = tomllib.load(f)["project"]["scripts"]
+    return {name: target.split(":")[0] for name, target in scripts.items()}
+
+
+def measure_import_times(module: str) -> dict[str, float]:
+    """Cumulative milliseconds to import each module in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        import_times[name.strip()] = int(cumulative) / 1000
+    return import_times
+
+
+def run_startup_benchmark(
+    entry_points: dict[str, str], num_runs: int = 5, num_heaviest: int = 5
+) -> dict:
+    """Import time of each entry point, the fastest of several runs to ignore
+    noise from the rest of the system"""
+    results = {}
+    for name, module in entry_points.items():
+        runs = [measure_import_times(module) for _ in range(num_runs)]
+        import_times = defaultdict(lambda: float("inf"))
+        for run in runs:
+            for imported, ms in run.items():
+                import_times[imported] = min(import_times[imported], ms)
+
+        # top-level packages only, their submodules are counted within them
+        packages = {
+            imported: ms for imported, ms in import_times.items() if "." not in imported
+        }
+        heaviest = sorted(packages.items(), key=lambda item: -item[1])[:num_heaviest]
+        results[name] = {
+            "module": module,
+            "import_ms": import_times[module],
+            "heaviest_ms": dict(heaviest),
+        }
+    return results
+
+
+def compare_to_budgets(
+    results: dict, budgets: dict[str, float], scale: float = 1.0
+) -> list[str]:
+    """Return a description of every entry point over its budget"""
+    failures = []
+    for name, result in results.items():
+        if name not in budgets:
+            failures.append(f"{name} has no startup budget")
+            continue
+        budget = scale * budgets[name]
+        if result["import_ms"] > budget:
+            heaviest = ", ".join(
+                f"{imported} {ms:.0f}ms"
+                for imported, ms in result["heaviest_ms"].items()
+            )
+            failures.append(
+                f"{name} imports in {result['import_ms']:.0f}ms, over its "
+                f"{budget:.0f}ms budget ({heaviest})"
+            )
+    return failures
@@ -0,0 +1,65 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from rubiks_cube_solver.constants import CUBE_STATE_PATH
+
+if TYPE_CHECKING:
+    from rubiks_cube_solver.move import Moves
+
+
+class CubeStateTracker:
+    """Persists the last known cube state across runs.
+
+    Every move run through `track_moves` is applied to the stored state, so
+    the next scan only has to confirm the prediction. The state is cleared
+    while moves are running, so an interrupted run forces a full scan.
+    """
+
+    def __init__(self, path: Path = CUBE_STATE_PATH):
+        self.path = path
+        self.cube_state: Optional[str] = None
+        if path.exists():
+            with open(path) as f:
+                self.cube_state = json.load(f)["cube_state"]
+
+    def set(self, cube_state: Optional[str]):
+        self.cube_state = cube_state
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"cube_state": cube_state, "time": time.time()}, f)
+        tmp_path.replace(self.path)
+
+    def invalidate(self):
+        if self.cube_state is not None:
+            self.set(None)
+
+    @contextmanager
+    def track_moves(self, moves: "Moves"):
+        # the cube model needs numpy, imported on the first tracked move
+        from rubiks_cube_solver.cube import apply_moves
+        from rubiks_cube_solver.move import as_moves
+
+        try:
+            codes = as_moves(moves)
+        except ValueError:
+            # moves the cube model does not know, e.g. typos, force a full scan
+            codes = None
+        cube_state = self.cube_state
+        self.invalidate()
+        yield
+        if cube_state is not None and codes is not None:
+            self.set(apply_moves(cube_state, codes))
+            logging.debug(f"Tracked cube state: {self.cube_state}")
+
+    def scan(self, perception) -> str:
+        """Scan the cube, confirming the tracked state when there is one"""
+        expected = self.cube_state
+        self.invalidate()
+        cube_state = perception.get_cube_state(expected=expected)
+        self.set(cube_state)
+        return cube_state
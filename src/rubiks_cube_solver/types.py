@@ -1,8 +1,14 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from enum import Enum
-from typing import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
 
-import numpy as np
+# numpy is only needed for annotations, keeping it out of the light entry
+# points, e.g. `move` and `jog`
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Position(Enum):
@@ -51,6 +57,40 @@ class Image:
     hsv: np.ndarray
 
 
+@dataclass
+class SettledFrame:
+    frame: np.ndarray
+    # Seconds from the first read until the frame was still
+    settle_time: float
+    num_frames: int
+    # False when the deadline passed first, the last frame is returned
+    settled: bool
+
+
+@dataclass
+class CameraConfig:
+    width: int = 640
+    height: int = 480
+    fourcc: str = "MJPG"
+    fps: int = 30
+    # None selects the automatic mode
+    exposure: Optional[int] = 90
+    white_balance: Optional[int] = None
+    buffer_size: int = 1
+    flush_frames: int = 1
+    keep_open: bool = True
+
+
+@dataclass
+class RigConfig:
+    name: str
+    arduino_path: str
+    camera_indices: dict[Position, int]
+    # Holds the rig's faces.json, homographies.npz, cameras.json and
+    # cube_state.json
+    data_path: Path
+
+
 @dataclass
 class Calibration:
     facet_coordinates: dict[Face, Iterable[Coordinate]]
@@ -0,0 +1,201 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from rubiks_cube_solver.cube import (
+    CENTER_FACELETS,
+    CORNER_COLORS,
+    CORNER_FACELETS,
+    EDGE_COLORS,
+    EDGE_FACELETS,
+    FACE_ORDER,
+    NUM_FACELETS,
+    permutation_parity,
+    read_corner,
+    read_edge,
+)
+from rubiks_cube_solver.types import Face
+
+
+@dataclass
+class CubeStateValidation:
+    errors: list[str] = field(default_factory=list)
+    # How likely each facelet is to be misread, by index in the state
+    blame: dict[int, float] = field(default_factory=lambda: defaultdict(float))
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def add_error(self, error: str, facelets: Iterable[int] = (), weight: float = 1):
+        self.errors.append(error)
+        for facelet in facelets:
+            self.blame[facelet] += weight
+
+    def get_face_scores(self) -> dict[Face, float]:
+        scores = {Face(face): 0.0 for face in FACE_ORDER}
+        for facelet, blame in self.blame.items():
+            scores[Face(FACE_ORDER[facelet // 9])] += blame
+        return scores
+
+    def get_suspect_faces(self) -> list[Face]:
+        """Faces with blamed facelets, the most likely misread first"""
+        scores = self.get_face_scores()
+        suspects = [face for face, score in scores.items() if score > 0]
+        return sorted(suspects, key=lambda face: -scores[face])
+
+
+def _get_invalid_cubie_facelets(
+    cube_state: str,
+    i: int,
+    facelets: list[int],
+    read_cubie: Callable[[str, int], Optional[tuple[int, int]]],
+    scarce_colors: list[str],
+) -> list[int]:
+    """Facelets of an invalid cubie which a scarce color would make valid,
+    or all of them when none would"""
+    repairable = [
+        f
+        for f in facelets
+        if any(
+            read_cubie(cube_state[:f] + color + cube_state[f + 1 :], i) is not None
+            for color in scarce_colors
+        )
+    ]
+    return repairable or facelets
+
+
+def _check_cubies(
+    validation: CubeStateValidation,
+    cubies: dict[int, list[int]],
+    names: list[str],
+    facelets: list[list[int]],
+):
+    for cubie, positions in cubies.items():
+        if len(positions) > 1:
+            # one of the copies is misread, but not which one
+            validation.add_error(
+                f"{names[cubie]} appears at {[names[i] for i in positions]}",
+                [f for i in positions for f in facelets[i]],
+                1 / len(positions),
+            )
+    missing = [names[cubie] for cubie in range(len(names)) if cubie not in cubies]
+    if missing:
+        validation.add_error(f"Missing {missing}")
+
+
+def _blame_repairs(cube_state: str, validation: CubeStateValidation):
+    """Blame the facelets whose recoloring fixes the most errors.
+
+    A misread takes a facelet from a scarce color to an abundant one, so
+    every such recoloring is tried. The ones that fix the most errors, e.g.
+    all of them for a single misread, outweigh the blame of the checks.
+    """
+    counts = Counter(cube_state)
+    abundant = {color for color in FACE_ORDER if counts[color] > 9}
+    scarce_colors = [color for color in FACE_ORDER if counts[color] < 9]
+
+    num_fixed: dict[int, int] = {}
+    for f, color in enumerate(cube_state):
+        if color not in abundant or f in CENTER_FACELETS:
+            continue
+        for scarce in scarce_colors:
+            repaired = _check_cube_state(cube_state[:f] + scarce + cube_state[f + 1 :])
+            fixed = len(validation.errors) - len(repaired.errors)
+            num_fixed[f] = max(num_fixed.get(f, 0), fixed)
+
+    most_fixed = max(num_fixed.values(), default=0)
+    if most_fixed <= 0:
+        return
+    best = [f for f, fixed in num_fixed.items() if fixed == most_fixed]
+    for f in best:
+        validation.blame[f] += len(validation.errors) / len(best)
+
+
+def validate_cube_state(cube_state: str) -> CubeStateValidation:
+    """Check that a facelet string is a reachable cube state.
+
+    Beyond listing what is wrong, every check blames the facelets it
+    implicates, so the faces most likely misread can be rescanned first.
+    """
+    validation = _check_cube_state(cube_state)
+    if not validation.valid:
+        _blame_repairs(cube_state, validation)
+    return validation
+
+
+def _check_cube_state(cube_state: str) -> CubeStateValidation:
+    validation = CubeStateValidation()
+    if len(cube_state) != NUM_FACELETS or not set(cube_state) <= set(FACE_ORDER):
+        validation.add_error(f"Malformed cube state: {cube_state}")
+        return validation
+
+    for face, center in zip(FACE_ORDER, CENTER_FACELETS, strict=True):
+        if cube_state[center] != face:
+            validation.add_error(f"{face} center is {cube_state[center]}", [center])
+
+    counts = Counter(cube_state)
+    # a misread takes a facelet from one of these colors
+    scarce_colors = [color for color in FACE_ORDER if counts[color] < 9]
+    for color in FACE_ORDER:
+        if counts[color] > 9:
+            # any non-center facelet of the color may be the misread one
+            facelets = [
+                i
+                for i, c in enumerate(cube_state)
+                if c == color and i not in CENTER_FACELETS
+            ]
+            validation.add_error(
+                f"{counts[color]} {color} facelets",
+                facelets,
+                (counts[color] - 9) / len(facelets),
+            )
+        elif counts[color] < 9:
+            validation.add_error(f"{counts[color]} {color} facelets")
+
+    cp, co = np.zeros(8, dtype=int), np.zeros(8, dtype=int)
+    corners: dict[int, list[int]] = defaultdict(list)
+    for i, facelets in enumerate(CORNER_FACELETS):
+        corner = read_corner(cube_state, i)
+        if corner is None:
+            colors = "".join(cube_state[f] for f in facelets)
+            validation.add_error(
+                f"No corner {colors} at {CORNER_COLORS[i]}",
+                _get_invalid_cubie_facelets(
+                    cube_state, i, facelets, read_corner, scarce_colors
+                ),
+            )
+            continue
+        cp[i], co[i] = corner
+        corners[cp[i]].append(i)
+    _check_cubies(validation, corners, CORNER_COLORS, CORNER_FACELETS)
+
+    ep, eo = np.zeros(12, dtype=int), np.zeros(12, dtype=int)
+    edges: dict[int, list[int]] = defaultdict(list)
+    for i, facelets in enumerate(EDGE_FACELETS):
+        edge = read_edge(cube_state, i)
+        if edge is None:
+            colors = "".join(cube_state[f] for f in facelets)
+            validation.add_error(
+                f"No edge {colors} at {EDGE_COLORS[i]}",
+                _get_invalid_cubie_facelets(
+                    cube_state, i, facelets, read_edge, scarce_colors
+                ),
+            )
+            continue
+        ep[i], eo[i] = edge
+        edges[ep[i]].append(i)
+    _check_cubies(validation, edges, EDGE_COLORS, EDGE_FACELETS)
+
+    # parities are only meaningful once every cubie is accounted for
+    if validation.valid:
+        if co.sum() % 3:
+            validation.add_error("Corners are twisted")
+        if eo.sum() % 2:
+            validation.add_error("An edge is flipped")
+        if permutation_parity(cp) != permutation_parity(ep):
+            validation.add_error("Two cubies are swapped")
+
+    return validation
@@ -0,0 +1,110 @@
+from collections import deque
+
+import pytest
+
+from rubiks_cube_solver.arduino import Arduino, ArduinoTimeoutError
+from rubiks_cube_solver.types import Position
+
+TIMEOUTS = {"MOVE:": 0.05, "MOVES:": 0.05, "LIGHT:": 0.05, "SYNC:": 0.05}
+
+
+class FakeSerial:
+    """Acks commands like the sketch, losing the commands or acks it is told to"""
+
+    def __init__(self):
+        self.responses = deque([b"STATUS:READY\n"])
+        self.num_moves = 0
+        self.executed: list[str] = []
+        self.lose_commands = 0
+        self.lose_acks = 0
+
+    def write(self, data: bytes):
+        command = data.decode().strip().upper()
+        if command.startswith("SYNC:"):
+            self.responses.append(f"COUNT:{self.num_moves}\n".encode())
+        elif self.lose_commands:
+            self.lose_commands -= 1
+            return len(data)
+        elif command.startswith("MOVE:"):
+            self.num_moves += 1
+            self.executed.append(command.removeprefix("MOVE:"))
+        elif command.startswith("MOVES:"):
+            moves = command.removeprefix("MOVES:").split(",")
+            self.num_moves += len(moves)
+            self.executed.extend(moves)
+
+        if self.lose_acks and not command.startswith("SYNC:"):
+            self.lose_acks -= 1
+            return len(data)
+        self.responses.append(f"DONE:{command}\n".encode())
+        return len(data)
+
+    def readline(self) -> bytes:
+        return self.responses.popleft() if self.responses else b""
+
+    def reset_input_buffer(self):
+        self.responses.clear()
+
+    in_waiting = 0
+    out_waiting = 0
+
+
+@pytest.fixture
+def serial() -> FakeSerial:
+    return FakeSerial()
+
+
+@pytest.fixture
+def arduino(serial) -> Arduino:
+    arduino = Arduino(command_timeouts=TIMEOUTS, max_retries=2, connection=serial)
+    arduino.wait_for_ready()
+    return arduino
+
+
+def test_moves(arduino, serial):
+    arduino.run_moves(["R", "U'"])
+    arduino.run_parallel_moves(["R", "L2"])
+    assert serial.executed == ["R", "U'", "R", "L2"]
+    assert arduino.num_moves_acked == 4
+    assert arduino.num_resyncs == 0
+
+
+def test_lost_command_is_resent(arduino, serial):
+    serial.lose_commands = 1
+    arduino.run_move("R")
+    assert serial.executed == ["R"]
+    assert arduino.num_moves_acked == 1
+    assert arduino.num_resyncs == 1
+
+
+def test_lost_ack_is_not_resent(arduino, serial):
+    serial.lose_acks = 1
+    arduino.run_parallel_moves(["U", "D"])
+    arduino.run_move("F")
+    assert serial.executed == ["U", "D", "F"]
+    assert arduino.num_moves_acked == 3
+    assert arduino.num_resyncs == 1
+
+
+def test_restart_resets_move_count(arduino, serial):
+    arduino.run_moves(["R", "U"])
+    # the Arduino reboots and loses the command sent meanwhile
+    serial.num_moves = 0
+    serial.responses.append(b"STATUS:READY\n")
+    serial.lose_commands = 1
+    arduino.run_move("F")
+    assert serial.executed == ["R", "U", "F"]
+    assert arduino.num_moves_acked == 1
+
+
+def test_gives_up_on_dead_link(arduino, serial):
+    serial.lose_commands = 100
+    with pytest.raises(ArduinoTimeoutError):
+        arduino.run_move("R")
+    assert serial.executed == []
+
+
+def test_light_commands_are_resent(arduino, serial):
+    serial.lose_acks = 1
+    arduino.turn_light_on(Position.UPPER)
+    assert arduino.num_resyncs == 1
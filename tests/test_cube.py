@@ -0,0 +1,54 @@
+import kociemba
+import numpy as np
+
+from rubiks_cube_solver.cube import (
+    SOLVED_STATE,
+    apply_moves,
+    cubies_to_state,
+    is_solved,
+    random_cube_state,
+    state_to_cubies,
+)
+from rubiks_cube_solver.move import MOVES, generate_scrambles, get_rng, invert_moves
+
+
+def test_moves_invert():
+    rng = get_rng(0)
+    for scramble in generate_scrambles(20, 25, rng):
+        cube_state = apply_moves(SOLVED_STATE, scramble)
+        assert apply_moves(cube_state, invert_moves(scramble)) == SOLVED_STATE
+
+
+def test_moves_match_kociemba():
+    # kociemba solves the states of our move model, so both agree on moves
+    for move in MOVES:
+        cube_state = apply_moves(SOLVED_STATE, [move])
+        solution = kociemba.solve(cube_state).split()
+        assert is_solved(apply_moves(cube_state, solution))
+
+    for scramble in generate_scrambles(10, 20, get_rng(1)):
+        cube_state = apply_moves(SOLVED_STATE, scramble)
+        assert is_solved(apply_moves(cube_state, kociemba.solve(cube_state).split()))
+
+
+def test_quarter_turns_cycle():
+    for move in ["U", "R", "F", "D", "L", "B"]:
+        assert apply_moves(SOLVED_STATE, [move] * 4) == SOLVED_STATE
+        assert apply_moves(SOLVED_STATE, [move] * 2) == apply_moves(
+            SOLVED_STATE, [move + "2"]
+        )
+
+
+def test_cubies_round_trip():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        cube_state = random_cube_state(rng)
+        assert cubies_to_state(*state_to_cubies(cube_state)) == cube_state
+
+
+def test_random_states_are_solvable():
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        cube_state = random_cube_state(rng)
+        solution = kociemba.solve(cube_state).split()
+        assert is_solved(apply_moves(cube_state, solution))
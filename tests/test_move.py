@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from rubiks_cube_solver.move import (
+    MOVE_FACES,
+    MOVE_PAD,
+    MOVES,
+    as_moves,
+    decode_moves,
+    encode_moves,
+    generate_scrambles,
+    get_move_amounts,
+    get_move_faces,
+    get_rng,
+    invert_moves,
+    load_scramble_corpus,
+    save_scramble_corpus,
+)
+
+
+def test_encode_round_trip():
+    codes = encode_moves(MOVES)
+    assert codes.dtype == np.uint8
+    assert decode_moves(codes) == MOVES
+
+
+def test_unknown_move():
+    with pytest.raises(ValueError):
+        encode_moves(["X"])
+    with pytest.raises(ValueError):
+        as_moves(np.array([len(MOVES)], dtype=np.uint8))
+
+
+def test_invert_moves():
+    assert decode_moves(invert_moves(["R", "U'", "F2", "B2'"])) == [
+        "B2",
+        "F2'",
+        "U",
+        "R'",
+    ]
+
+
+def test_move_amounts():
+    assert get_move_amounts(encode_moves(["R", "R'", "R2", "R2'"])).tolist() == [
+        1,
+        1,
+        2,
+        2,
+    ]
+
+
+def test_scrambles_never_repeat_a_face():
+    scrambles = generate_scrambles(1000, 25, get_rng(0))
+    assert scrambles.shape == (1000, 25)
+    assert scrambles.dtype == np.uint8
+    faces = get_move_faces(scrambles)
+    assert not (faces[:, 1:] == faces[:, :-1]).any()
+    # every face and suffix shows up
+    assert set(np.unique(faces)) == set(range(len(MOVE_FACES)))
+    assert set(np.unique(scrambles)) == set(range(len(MOVES)))
+
+
+def test_seeded_scrambles_are_reproducible():
+    first = generate_scrambles(5, 20, get_rng(0))
+    assert (first == generate_scrambles(5, 20, get_rng(0))).all()
+    assert not (first == generate_scrambles(5, 20, get_rng(1))).all()
+
+
+def test_code_sequences():
+    assert as_moves([0, 5, MOVE_PAD]).tolist() == [0, 5]
+    assert as_moves(np.uint8(code) for code in [1, 2]).tolist() == [1, 2]
+    assert as_moves([]).dtype == np.uint8
+    for codes in [[len(MOVES)], [-1], [256]]:
+        with pytest.raises(ValueError):
+            as_moves(codes)
+
+
+def test_padding_is_dropped():
+    codes = np.array([0, 5, MOVE_PAD, MOVE_PAD], dtype=np.uint8)
+    assert as_moves(codes).tolist() == [0, 5]
+    assert decode_moves(codes) == ["U", "R'"]
+
+
+def test_random_state_corpus(tmp_path):
+    path = tmp_path / "scrambles.npy"
+    save_scramble_corpus(path, 20, 20, random_seed=0, random_state=True, chunk_size=8)
+    corpus = load_scramble_corpus(path)
+    # padded to fit kociemba's longest solutions
+    assert corpus.shape == (20, 24)
+    assert ((corpus < len(MOVES)) | (corpus == MOVE_PAD)).all()
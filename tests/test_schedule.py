@@ -0,0 +1,48 @@
+import numpy as np
+
+from rubiks_cube_solver.move import decode_moves, generate_scrambles, get_rng
+from rubiks_cube_solver.schedule import (
+    get_schedule_report,
+    predict_turn_time,
+    schedule_moves,
+)
+
+
+def test_opposite_faces_run_together():
+    schedule = schedule_moves(["R", "L'", "U", "D2", "F", "R", "L", "R"])
+    assert [decode_moves(step) for step in schedule] == [
+        ["R", "L'"],
+        ["U", "D2"],
+        ["F"],
+        ["R", "L"],
+        ["R"],
+    ]
+
+
+def test_steps_have_at_most_two_moves():
+    # the same face never repeats, so three moves in a row cannot share an axis
+    schedule = schedule_moves(["R", "L", "R'"])
+    assert [decode_moves(step) for step in schedule] == [["R", "L"], ["R'"]]
+
+
+def test_schedule_keeps_every_move_in_order():
+    for scramble in generate_scrambles(50, 25, get_rng(0)):
+        schedule = schedule_moves(scramble)
+        assert (np.concatenate(schedule) == scramble).all()
+        assert all(1 <= len(step) <= 2 for step in schedule)
+
+
+def test_empty_schedule():
+    assert schedule_moves([]) == []
+    report = get_schedule_report([])
+    assert report.num_moves == 0
+    assert report.parallel_time == 0
+
+
+def test_report():
+    report = get_schedule_report(schedule_moves(["R", "L2", "U"]))
+    assert report.num_moves == 3
+    assert report.num_steps == 2
+    assert report.saved_time > 0
+    assert report.parallel_time < report.serial_time
+    assert predict_turn_time(2) > predict_turn_time(1)
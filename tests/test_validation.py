@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from rubiks_cube_solver.cube import (
+    CENTER_FACELETS,
+    CORNER_FACELETS,
+    EDGE_FACELETS,
+    FACE_ORDER,
+    SOLVED_STATE,
+    random_cube_state,
+)
+from rubiks_cube_solver.types import Face
+from rubiks_cube_solver.validation import validate_cube_state
+
+
+def set_facelets(cube_state: str, facelets: dict[int, str]) -> str:
+    state = list(cube_state)
+    for f, color in facelets.items():
+        state[f] = color
+    return "".join(state)
+
+
+def move_stickers(cube_state: str, src: list[int], dst: list[int]) -> str:
+    """Put the stickers at `src` on the facelets `dst`, all at once"""
+    return set_facelets(cube_state, {d: cube_state[s] for s, d in zip(src, dst)})
+
+
+@pytest.fixture
+def cube_state() -> str:
+    return random_cube_state(np.random.default_rng(0))
+
+
+def test_valid_states():
+    rng = np.random.default_rng(1)
+    assert validate_cube_state(SOLVED_STATE).valid
+    for _ in range(50):
+        validation = validate_cube_state(random_cube_state(rng))
+        assert validation.valid, validation.errors
+        assert not validation.get_suspect_faces()
+
+
+def test_malformed(cube_state):
+    assert not validate_cube_state(cube_state[:-1]).valid
+    assert not validate_cube_state(cube_state[:-1] + "X").valid
+
+
+def test_twisted_corner(cube_state):
+    corner = CORNER_FACELETS[0]
+    twisted = move_stickers(cube_state, corner, corner[1:] + corner[:1])
+    assert validate_cube_state(twisted).errors == ["Corners are twisted"]
+
+
+def test_flipped_edge(cube_state):
+    edge = EDGE_FACELETS[0]
+    flipped = move_stickers(cube_state, edge, edge[::-1])
+    assert validate_cube_state(flipped).errors == ["An edge is flipped"]
+
+
+def test_swapped_edges(cube_state):
+    a, b = EDGE_FACELETS[0], EDGE_FACELETS[1]
+    swapped = move_stickers(cube_state, a + b, b + a)
+    assert validate_cube_state(swapped).errors == ["Two cubies are swapped"]
+
+
+def test_duplicate_corner(cube_state):
+    a, b = CORNER_FACELETS[0], CORNER_FACELETS[1]
+    duplicated = move_stickers(cube_state, a, b)
+    validation = validate_cube_state(duplicated)
+    assert any("appears at" in error for error in validation.errors)
+    assert any(error.startswith("Missing") for error in validation.errors)
+    # either copy may be the misread one
+    suspects = validation.get_suspect_faces()
+    assert {FACE_ORDER[f // 9] for f in a + b} & {face.value for face in suspects}
+
+
+def test_color_counts(cube_state):
+    f = next(f for f in range(54) if f not in CENTER_FACELETS)
+    color = next(c for c in FACE_ORDER if c != cube_state[f])
+    errors = validate_cube_state(set_facelets(cube_state, {f: color})).errors
+    assert f"10 {color} facelets" in errors
+    assert f"8 {cube_state[f]} facelets" in errors
+
+
+def test_wrong_center(cube_state):
+    errors = validate_cube_state(set_facelets(cube_state, {4: "R"})).errors
+    assert "U center is R" in errors
+
+
+def test_single_misread_blames_its_face():
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        cube_state = random_cube_state(rng)
+        f = int(rng.choice([f for f in range(54) if f not in CENTER_FACELETS]))
+        color = rng.choice([c for c in FACE_ORDER if c != cube_state[f]])
+        validation = validate_cube_state(set_facelets(cube_state, {f: color}))
+
+        assert not validation.valid
+        assert validation.get_suspect_faces()[0] == Face(FACE_ORDER[f // 9])